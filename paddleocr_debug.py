@@ -3,29 +3,102 @@ import os
 import sys
 import time
 import json
+import queue
+import threading
+import importlib.util
+import inspect
+from importlib.metadata import version, PackageNotFoundError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
 
-# 核心套件
-import cv2
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+# 核心套件（PIL、paddleocr）延遲到實際使用時才載入，以縮短啟動時間
 
+# 環境檢查的套件（發行套件名稱）
+PACKAGES = [
+    'paddlepaddle',
+    'paddleocr',
+    'opencv-python',
+    'pillow',
+    'numpy'
+]
+
+
+@lru_cache(maxsize=None)
+def _module_available(module_name: str) -> bool:
+    """檢查模組是否可匯入（不實際載入）"""
+    return importlib.util.find_spec(module_name) is not None
+
+
+# JSON 報告序列化：優先使用 orjson（輸出 UTF-8 位元組），否則退回標準函式庫
 try:
-    from paddleocr import PaddleOCR
-    PADDLEOCR_AVAILABLE = True
+    import orjson
+    
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
 except ImportError:
-    PADDLEOCR_AVAILABLE = False
-    print("警告: PaddleOCR 未安裝")
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _paddleocr_available() -> bool:
+    """PaddleOCR 是否可用"""
+    return _module_available('paddleocr')
+
+
+def _accepts_kwarg(func, name: str) -> bool:
+    """檢查函數是否接受指定的關鍵字參數"""
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return True
+    
+    return name in params or any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values())
+
+
+# 設定環境變數 OCR_PROFILE=1 以 cProfile 分析完整診斷的識別流程
+PROFILE_ENABLED = os.environ.get('OCR_PROFILE') == '1'
+
+# 測試案例：(文字, 檔名)
+TEST_CASES = [
+    ("Hello", "english_simple"),
+    ("Hello World", "english_phrase"),
+    ("123456", "numbers"),
+    ("測試", "chinese_simple"),
+    ("測試中文", "chinese_phrase"),
+    ("Mixed 混合 123", "mixed_content"),
+    ("ABCDEFG\n1234567", "multiline"),
+]
+
+# 測試圖片的字體大小與畫布尺寸（寬, 高）
+TEST_FONT_SIZE = 48
+TEST_IMAGE_SIZE = (800, 200)
 
 
 class PaddleOCRDiagnostic:
     """PaddleOCR 診斷工具"""
     
-    def __init__(self):
+    # 已初始化的引擎快取（以配置為鍵），避免重複載入模型權重
+    _engine_cache: Dict[frozenset, 'PaddleOCR'] = {}
+    
+    def __init__(self, save_test_images: bool = False):
         self.ocr_engine = None
+        # 測試圖片：(檔案路徑, 預期文字, BGR 影像陣列)
         self.test_images = []
+        # 是否將測試圖片另存到磁碟（OCR 直接使用記憶體中的陣列）
+        self.save_test_images = save_test_images
+        # 實際寫入磁碟的測試圖片路徑（報告中只列出存在的檔案）
+        self._saved_images = set()
+        self._font = None
+        # 每個執行緒各自持有畫布，平行繪製時互不干擾
+        self._local = threading.local()
+        
+        # 輸出資料夾只在初始化時建立一次
+        os.makedirs('./output', exist_ok=True)
+        if save_test_images:
+            os.makedirs("./test_examples", exist_ok=True)
         
     def check_environment(self):
         """檢查環境配置"""
@@ -34,132 +107,230 @@ class PaddleOCRDiagnostic:
         # Python 版本
         print(f"Python 版本: {sys.version}")
         
-        # 套件檢查
-        packages = [
-            'paddlepaddle',
-            'paddleocr', 
-            'opencv-python',
-            'pillow',
-            'numpy'
-        ]
-        
-        for package in packages:
+        # 套件檢查（只讀取套件中繼資料，不執行套件程式碼）
+        for package in PACKAGES:
             try:
-                __import__(package.replace('-', '_'))
-                print(f"✓ {package}: 已安裝")
-            except ImportError:
+                print(f"✓ {package}: {version(package)}")
+            except PackageNotFoundError:
                 print(f"✗ {package}: 未安裝")
         
         # PaddleOCR 可用性
-        if PADDLEOCR_AVAILABLE:
+        paddleocr_available = _paddleocr_available()
+        if paddleocr_available:
             print("✓ PaddleOCR: 可用")
         else:
             print("✗ PaddleOCR: 不可用")
             
-        return PADDLEOCR_AVAILABLE
+        return paddleocr_available
     
     def test_ocr_initialization(self):
         """測試 OCR 初始化"""
         print("\n=== OCR 初始化測試 ===")
         
-        if not PADDLEOCR_AVAILABLE:
+        if not _paddleocr_available():
             print("PaddleOCR 不可用，跳過測試")
             return False
         
+        # find_spec 只確認套件存在，實際匯入仍可能因相依套件損壞而失敗
+        try:
+            from paddleocr import PaddleOCR
+        except ImportError as e:
+            print(f"✗ PaddleOCR 匯入失敗: {e}")
+            return False
+        
+        # 診斷時一次只處理一張小圖，rec_batch_num=1 可大幅縮小 Paddle 記憶體池；
+        # 測試圖片皆為水平文字，不需要角度分類器；
+        # enable_hpi 啟用 PaddleOCR 3.0 高效能推理（自動選擇 ONNX Runtime / OpenVINO / TensorRT）
         configs = [
-            {'lang': 'ch'},
-            {'lang': 'en'},
-            {'lang': 'ch', 'use_angle_cls': True},
-            {'lang': 'en', 'use_angle_cls': True},
+            {'lang': 'ch', 'rec_batch_num': 1, 'enable_hpi': True},
+            {'lang': 'en', 'rec_batch_num': 1, 'enable_hpi': True},
         ]
         
         for i, config in enumerate(configs):
             print(f"\n測試配置 {i+1}: {config}")
-            try:
-                start_time = time.time()
-                ocr = PaddleOCR(**config)
-                init_time = time.time() - start_time
-                
-                print(f"✓ 初始化成功，耗時: {init_time:.2f} 秒")
-                
-                if self.ocr_engine is None:
-                    self.ocr_engine = ocr
-                    self.current_config = config
-                    print("✓ 設為預設引擎")
-                
-                return True
-                
-            except Exception as e:
-                print(f"✗ 初始化失敗: {e}")
+            key = frozenset(config.items())
+            ocr = self._engine_cache.get(key)
+            
+            if ocr is not None:
+                print("✓ 使用已快取的引擎")
+            else:
+                try:
+                    start_time = time.perf_counter()
+                    ocr = self._create_engine(PaddleOCR, config)
+                    init_time = time.perf_counter() - start_time
+                    
+                    print(f"✓ 初始化成功，耗時: {init_time:.2f} 秒")
+                    self._engine_cache[key] = ocr
+                    
+                except Exception as e:
+                    print(f"✗ 初始化失敗: {e}")
+                    continue
+            
+            if self.ocr_engine is None:
+                self.ocr_engine = ocr
+                self.current_config = config
+                print("✓ 設為預設引擎")
+            
+            return True
         
         return False
     
-    def create_test_images(self):
-        """建立測試圖片"""
+    def _create_engine(self, PaddleOCR, config: Dict):
+        """建立 PaddleOCR 引擎，不支援高效能推理時自動改用一般模式"""
+        if not config.get('enable_hpi'):
+            return PaddleOCR(**config)
+        
+        fallback = {k: v for k, v in config.items() if k != 'enable_hpi'}
+        if not _accepts_kwarg(PaddleOCR.__init__, 'enable_hpi'):
+            return PaddleOCR(**fallback)
+        
+        try:
+            return PaddleOCR(**config)
+        except Exception as e:
+            print(f"⚠️ 高效能推理不可用（{e}），改用一般模式")
+            return PaddleOCR(**fallback)
+    
+    def create_test_images(self, save: Optional[bool] = None, parallel: bool = True):
+        """建立測試圖片；parallel=False 時在目前執行緒依序繪製（例如效能分析時）"""
         print("\n=== 建立測試圖片 ===")
         
-        test_cases = [
-            ("Hello", "english_simple"),
-            ("Hello World", "english_phrase"),
-            ("123456", "numbers"),
-            ("測試", "chinese_simple"),
-            ("測試中文", "chinese_phrase"),
-            ("Mixed 混合 123", "mixed_content"),
-            ("ABCDEFG\n1234567", "multiline"),
-        ]
+        if save is None:
+            save = self.save_test_images
+        if save and not self.save_test_images:
+            os.makedirs("./test_examples", exist_ok=True)
         
-        os.makedirs("./test_examples", exist_ok=True)
+        # 先在主執行緒解析字體，避免各執行緒重複載入
+        self._get_font()
         
-        for text, name in test_cases:
-            filename = f"./test_examples/test_{name}.png"
+        # 相同內容的圖片只繪製一次
+        unique_cases = {}
+        for text, name in TEST_CASES:
+            unique_cases.setdefault(self._render_key(text), (text, name))
+        
+        if parallel:
+            def render(case):
+                messages = []
+                return self._render_test_image(*case, save, messages.append), messages
+            
+            with ThreadPoolExecutor(max_workers=min(4, len(unique_cases))) as executor:
+                renders = list(executor.map(render, unique_cases.values()))
             
+            # 繪製訊息依測試案例順序由目前執行緒輸出，不與其他執行緒的訊息交錯
+            for _, messages in renders:
+                for message in messages:
+                    print(message)
+            rendered_cache = dict(zip(unique_cases, (rendered for rendered, _ in renders)))
+        else:
+            rendered_cache = {key: self._render_test_image(text, name, save)
+                              for key, (text, name) in unique_cases.items()}
+        
+        for text, name in TEST_CASES:
+            rendered = rendered_cache[self._render_key(text)]
+            if rendered is not None:
+                filename, image = self._reuse_test_image(rendered, name, save)
+                self.test_images.append((filename, text, image))
+    
+    @staticmethod
+    def _render_key(text: str) -> tuple:
+        """測試圖片的內容鍵：文字、字體大小與畫布尺寸相同時繪製結果相同"""
+        return text, TEST_FONT_SIZE, TEST_IMAGE_SIZE
+    
+    @staticmethod
+    def _test_image_path(name: str) -> str:
+        """測試案例的圖片檔案路徑"""
+        return f"./test_examples/test_{name}.png"
+    
+    def _reuse_test_image(self, rendered: Tuple[str, 'np.ndarray'], name: str, save: bool,
+                          log: Callable[[str], None] = print) -> Tuple[str, 'np.ndarray']:
+        """沿用已繪製的相同影像，但保留此測試案例自己的檔名（需要存檔時另存一份）"""
+        source, image = rendered
+        filename = self._test_image_path(name)
+        
+        if save and filename != source:
+            import numpy as np
+            from PIL import Image
+            
+            Image.fromarray(np.ascontiguousarray(image[:, :, ::-1])).save(filename, 'PNG')
+            self._saved_images.add(filename)
+            log(f"✓ 建立: {filename}")
+        
+        return filename, image
+    
+    def _get_font(self):
+        """載入測試圖片字體（只解析一次，之後重複使用）"""
+        if self._font is not None:
+            return self._font
+        
+        from PIL import ImageFont
+        
+        # 嘗試載入字體
+        font = None
+        font_paths = [
+            "C:/Windows/Fonts/msyh.ttc",
+            "C:/Windows/Fonts/arial.ttf",
+            "/System/Library/Fonts/Arial.ttf",
+            "arial.ttf"
+        ]
+        
+        for font_path in font_paths:
             try:
-                img = Image.new('RGB', (800, 200), 'white')
-                draw = ImageDraw.Draw(img)
-                
-                # 嘗試載入字體
-                font = None
-                font_paths = [
-                    "C:/Windows/Fonts/msyh.ttc",
-                    "C:/Windows/Fonts/arial.ttf",
-                    "/System/Library/Fonts/Arial.ttf",
-                    "arial.ttf"
-                ]
-                
-                for font_path in font_paths:
-                    try:
-                        font = ImageFont.truetype(font_path, 48)
-                        break
-                    except:
-                        continue
-                
-                if font is None:
-                    font = ImageFont.load_default()
-                
-                # 計算文字位置
-                if '\n' in text:
-                    lines = text.split('\n')
-                    y_start = 50
-                    for line in lines:
-                        bbox = draw.textbbox((0, 0), line, font=font)
-                        text_width = bbox[2] - bbox[0]
-                        x = (img.width - text_width) // 2
-                        draw.text((x, y_start), line, font=font, fill='black')
-                        y_start += 60
-                else:
-                    bbox = draw.textbbox((0, 0), text, font=font)
-                    text_width = bbox[2] - bbox[0]
-                    text_height = bbox[3] - bbox[1]
-                    x = (img.width - text_width) // 2
-                    y = (img.height - text_height) // 2
-                    draw.text((x, y), text, font=font, fill='black')
-                
+                font = ImageFont.truetype(font_path, TEST_FONT_SIZE)
+                break
+            except:
+                continue
+        
+        if font is None:
+            font = ImageFont.load_default()
+        
+        self._font = font
+        return font
+    
+    def _get_canvas(self):
+        """取得重複使用的白色畫布（每次繪製前清空，避免重複配置）"""
+        canvas = getattr(self._local, 'canvas', None)
+        
+        if canvas is None:
+            from PIL import Image, ImageDraw
+            
+            img = Image.new('RGB', TEST_IMAGE_SIZE, 'white')
+            canvas = self._local.canvas = (img, ImageDraw.Draw(img))
+        else:
+            img = canvas[0]
+            img.paste((255, 255, 255), (0, 0) + img.size)
+        
+        return canvas
+    
+    def _render_test_image(self, text: str, name: str, save: bool = False,
+                           log: Callable[[str], None] = print) -> Optional[Tuple[str, 'np.ndarray']]:
+        """繪製單張測試圖片，成功時回傳 (檔案路徑, BGR 影像陣列)；進度訊息交由 log 輸出"""
+        import numpy as np
+        
+        filename = self._test_image_path(name)
+        
+        try:
+            img, draw = self._get_canvas()
+            
+            font = self._get_font()
+            
+            # 置中繪製文字（單行與多行共用，排版交由 Pillow 處理）
+            draw.multiline_text((img.width / 2, img.height / 2), text, font=font, fill='black',
+                                anchor='mm', align='center', spacing=12)
+            
+            # RGB → BGR，直接交給 Paddle，不必經過磁碟
+            image = np.ascontiguousarray(np.asarray(img)[:, :, ::-1])
+            
+            if save:
                 img.save(filename, 'PNG')
-                self.test_images.append((filename, text))
-                print(f"✓ 建立: {filename}")
-                
-            except Exception as e:
-                print(f"✗ 建立失敗 {filename}: {e}")
+                self._saved_images.add(filename)
+                log(f"✓ 建立: {filename}")
+            else:
+                log(f"✓ 建立: {os.path.basename(filename)}（記憶體）")
+            
+            return filename, image
+            
+        except Exception as e:
+            log(f"✗ 建立失敗 {filename}: {e}")
+            return None
     
     def test_ocr_recognition(self):
         """測試 OCR 識別"""
@@ -173,62 +344,185 @@ class PaddleOCRDiagnostic:
             print("沒有測試圖片")
             return
         
-        results = []
+        results = [None] * len(self.test_images)
+        
+        # 相同影像只識別一次
+        unique_images = {}
+        for _, _, image in self.test_images:
+            unique_images.setdefault(id(image), image)
+        images = list(unique_images.values())
         
-        for image_path, expected_text in self.test_images:
-            print(f"\n測試圖片: {os.path.basename(image_path)}")
-            print(f"預期文字: '{expected_text}'")
+        # 一次送出所有測試圖片，讓 Paddle 在內部批次處理
+        try:
+            start_time = time.perf_counter()
             
             try:
-                start_time = time.time()
-                
-                # 嘗試不同的調用方法
-                try:
-                    ocr_result = self.ocr_engine.predict(image_path)
-                except AttributeError:
-                    ocr_result = self.ocr_engine.ocr(image_path)
-                
-                process_time = time.time() - start_time
-                
-                # 解析結果
-                recognized_text = self._extract_text_from_result(ocr_result)
-                
-                print(f"識別文字: '{recognized_text}'")
-                print(f"處理時間: {process_time:.2f} 秒")
-                
-                # 簡單的準確度評估
-                if recognized_text.strip():
-                    if expected_text.lower() in recognized_text.lower() or recognized_text.lower() in expected_text.lower():
-                        accuracy = "✓ 良好"
-                    else:
-                        accuracy = "△ 部分"
+                batch_results = [[r] for r in self.ocr_engine.predict(images)]
+            except AttributeError:
+                batch_results = [self.ocr_engine.ocr(image) for image in images]
+            
+            batch_time = time.perf_counter() - start_time
+            process_time = batch_time / len(images)
+            batch_results = dict(zip(unique_images, batch_results))
+            print(f"批次識別 {len(images)} 張圖片，總耗時: {batch_time:.2f} 秒")
+            
+        except Exception as e:
+            print(f"✗ 識別失敗: {e}")
+            for i, (image_path, expected_text, _) in enumerate(self.test_images):
+                results[i] = self._build_result(image_path, expected_text, '', 0, e)
+            return results
+        
+        for i, (image_path, expected_text, image) in enumerate(self.test_images):
+            recognized_text = self._extract_text_from_result(batch_results[id(image)])
+            results[i] = self._build_result(image_path, expected_text, recognized_text, process_time)
+        
+        return results
+    
+    def _recognize_one(self, image, log: Callable[[str], None] = print):
+        """對單張圖片（路徑或影像陣列）執行 OCR，回傳 (識別文字, 耗時)"""
+        start_time = time.perf_counter()
+        
+        # 嘗試不同的調用方法
+        try:
+            ocr_result = self.ocr_engine.predict(image)
+        except AttributeError:
+            ocr_result = self.ocr_engine.ocr(image)
+        
+        process_time = time.perf_counter() - start_time
+        return self._extract_text_from_result(ocr_result, log), process_time
+    
+    def _build_result(self, image_path: str, expected_text: str, recognized_text: str,
+                      process_time: float, error: Optional[Exception] = None) -> Dict:
+        """評估識別結果並建立結果記錄；測試圖片未存檔時 image 為 None"""
+        name = os.path.basename(image_path)
+        saved_path = image_path if image_path in self._saved_images else None
+        print(f"\n測試圖片: {name}")
+        print(f"預期文字: '{expected_text}'")
+        
+        if error is not None:
+            print(f"✗ 識別失敗: {error}")
+            return {
+                'image': saved_path,
+                'name': name,
+                'expected': expected_text,
+                'recognized': '',
+                'time': 0,
+                'success': False,
+                'error': str(error)
+            }
+        
+        print(f"識別文字: '{recognized_text}'")
+        print(f"處理時間: {process_time:.2f} 秒")
+        
+        # 簡單的準確度評估
+        if recognized_text.strip():
+            if expected_text.lower() in recognized_text.lower() or recognized_text.lower() in expected_text.lower():
+                accuracy = "✓ 良好"
+            else:
+                accuracy = "△ 部分"
+        else:
+            accuracy = "✗ 失敗"
+        
+        print(f"準確度: {accuracy}")
+        
+        return {
+            'image': saved_path,
+            'name': name,
+            'expected': expected_text,
+            'recognized': recognized_text,
+            'time': process_time,
+            'success': accuracy.startswith('✓')
+        }
+    
+    def _run_pipeline(self) -> List[Dict]:
+        """以佇列串接「建立圖片 → OCR 識別 → 彙整結果」三個階段"""
+        print("\n=== 建立測試圖片並識別 ===")
+        
+        # 佇列項目為 ('message', 訊息) 或 ('image' / 'result', ...)；各階段的進度訊息隨項目依序傳遞，
+        # 只由主執行緒輸出，不同階段的訊息不會交錯
+        ocr_queue = queue.Queue(maxsize=4)
+        report_queue = queue.Queue(maxsize=4)
+        
+        def produce():
+            rendered_cache = {}
+            log = lambda message: ocr_queue.put(('message', message))
+            
+            try:
+                for text, name in TEST_CASES:
+                    # 相同內容的圖片只繪製一次
+                    key = self._render_key(text)
+                    if key not in rendered_cache:
+                        rendered_cache[key] = self._render_test_image(text, name, self.save_test_images, log)
+                    
+                    rendered = rendered_cache[key]
+                    if rendered is not None:
+                        filename, image = self._reuse_test_image(rendered, name, self.save_test_images, log)
+                        self.test_images.append((filename, text, image))
+                        ocr_queue.put(('image', filename, text, image))
+            finally:
+                ocr_queue.put(None)
+        
+        def consume():
+            # 相同影像只識別一次
+            recognized = {}
+            log = lambda message: report_queue.put(('message', message))
+            
+            try:
+                while True:
+                    item = ocr_queue.get()
+                    if item is None:
+                        break
+                    if item[0] == 'message':
+                        report_queue.put(item)
+                        continue
+                    
+                    _, image_path, expected_text, image = item
+                    try:
+                        if id(image) not in recognized:
+                            recognized[id(image)] = self._recognize_one(image, log)
+                        recognized_text, process_time = recognized[id(image)]
+                        report_queue.put(('result', image_path, expected_text, recognized_text, process_time, None))
+                    except Exception as e:
+                        report_queue.put(('result', image_path, expected_text, '', 0, e))
+            finally:
+                report_queue.put(None)
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(produce)
+            executor.submit(consume)
+            
+            while True:
+                item = report_queue.get()
+                if item is None:
+                    break
+                if item[0] == 'message':
+                    print(item[1])
                 else:
-                    accuracy = "✗ 失敗"
-                
-                print(f"準確度: {accuracy}")
-                
-                results.append({
-                    'image': image_path,
-                    'expected': expected_text,
-                    'recognized': recognized_text,
-                    'time': process_time,
-                    'success': accuracy.startswith('✓')
-                })
-                
-            except Exception as e:
-                print(f"✗ 識別失敗: {e}")
-                results.append({
-                    'image': image_path,
-                    'expected': expected_text,
-                    'recognized': '',
-                    'time': 0,
-                    'success': False,
-                    'error': str(e)
-                })
+                    results.append(self._build_result(*item[1:]))
         
         return results
     
-    def _extract_text_from_result(self, result):
+    def _run_profiled(self) -> List[Dict]:
+        """在 cProfile 下建立圖片並識別，結果可用 snakeviz 檢視"""
+        import cProfile
+        import pstats
+        
+        # cProfile 只追蹤目前執行緒，因此不走管線，圖片也在目前執行緒依序繪製，再批次識別
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            self.create_test_images(parallel=False)
+            results = self.test_ocr_recognition()
+        finally:
+            profiler.disable()
+            profile_file = './output/ocr_diag.prof'
+            pstats.Stats(profiler).sort_stats('cumulative').dump_stats(profile_file)
+            print(f"\n✓ 效能分析已儲存: {profile_file}（檢視: snakeviz {profile_file}）")
+        
+        return results
+    
+    def _extract_text_from_result(self, result, log: Callable[[str], None] = print):
         """從 OCR 結果中提取文字"""
         text_lines = []
         
@@ -236,22 +530,20 @@ class PaddleOCRDiagnostic:
             if isinstance(result, list) and len(result) > 0:
                 ocr_result = result[0]
                 
-                # 新版 API
-                if hasattr(ocr_result, 'rec_texts') and ocr_result.rec_texts:
-                    text_lines.extend(ocr_result.rec_texts)
+                # 新版 API（屬性）與舊版 API 兼容（字典）
+                texts = getattr(ocr_result, 'rec_texts', None)
+                if not texts and isinstance(ocr_result, dict):
+                    texts = ocr_result.get('rec_texts')
                 
-                # 舊版 API 兼容
-                elif isinstance(ocr_result, dict) and 'rec_texts' in ocr_result:
-                    text_lines.extend(ocr_result['rec_texts'])
+                if texts is not None:
+                    text_lines = list(texts)
                 
-                # 傳統格式
-                elif isinstance(result, list):
-                    for line in result:
-                        if isinstance(line, list) and len(line) >= 2:
-                            text_lines.append(line[1][0])
+                # 傳統格式：[[box, (text, score)], ...]
+                elif isinstance(ocr_result, list):
+                    text_lines = [line[1][0] for line in ocr_result if isinstance(line, list) and len(line) >= 2]
         
         except Exception as e:
-            print(f"結果解析錯誤: {e}")
+            log(f"結果解析錯誤: {e}")
         
         return '\n'.join(text_lines)
     
@@ -265,7 +557,14 @@ class PaddleOCRDiagnostic:
             print("沒有測試結果")
             return
         
-        successful = sum(1 for r in results if r['success'])
+        # 單次走訪計算成功數與總耗時
+        successful = 0
+        total_time = 0.0
+        for r in results:
+            if r['success']:
+                successful += 1
+                total_time += r['time']
+        
         total = len(results)
         success_rate = (successful / total) * 100
         
@@ -274,12 +573,12 @@ class PaddleOCRDiagnostic:
         print(f"成功率: {success_rate:.1f}%")
         
         if successful > 0:
-            avg_time = sum(r['time'] for r in results if r['success']) / successful
+            avg_time = total_time / successful
             print(f"平均處理時間: {avg_time:.2f} 秒")
         
         print("\n=== 詳細結果 ===")
         for i, result in enumerate(results, 1):
-            print(f"\n測試 {i}: {os.path.basename(result['image'])}")
+            print(f"\n測試 {i}: {result['name']}")
             print(f"  預期: '{result['expected']}'")
             print(f"  識別: '{result['recognized']}'")
             print(f"  時間: {result['time']:.2f} 秒")
@@ -306,17 +605,15 @@ class PaddleOCRDiagnostic:
             'timestamp': datetime.now().isoformat(),
             'environment': {
                 'python_version': sys.version,
-                'paddleocr_available': PADDLEOCR_AVAILABLE
+                'paddleocr_available': _paddleocr_available()
             },
             'config': getattr(self, 'current_config', None),
             'results': results
         }
         
-        os.makedirs('./output', exist_ok=True)
         report_file = f"./output/ocr_diagnostic_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, ensure_ascii=False, indent=2)
+        Path(report_file).write_bytes(_dumps(report_data))
         
         print(f"\n✓ 診斷報告已儲存: {report_file}")
     
@@ -335,11 +632,11 @@ class PaddleOCRDiagnostic:
             print("\nOCR 初始化失敗，無法繼續")
             return
         
-        # 建立測試圖片
-        self.create_test_images()
-        
-        # OCR 識別測試
-        results = self.test_ocr_recognition()
+        # 建立測試圖片與 OCR 識別（管線並行；效能分析時改為依序執行）
+        if PROFILE_ENABLED:
+            results = self._run_profiled()
+        else:
+            results = self._run_pipeline()
         
         # 生成報告
         self.generate_report(results)
@@ -359,30 +656,38 @@ def main():
     print("5. OCR 識別測試")
     print("6. 退出")
     
+    def run_recognition():
+        if diagnostic.ocr_engine is None:
+            print("請先初始化 OCR 引擎（選項 3）")
+            return
+        
+        results = diagnostic.test_ocr_recognition()
+        if results:
+            diagnostic.generate_report(results)
+    
+    # 選項 → 動作（None 表示退出）
+    actions = {
+        '1': diagnostic.run_full_diagnostic,
+        '2': diagnostic.check_environment,
+        '3': diagnostic.test_ocr_initialization,
+        '4': lambda: diagnostic.create_test_images(save=True),
+        '5': run_recognition,
+        '6': None,
+    }
+    
     while True:
         choice = input("\n請選擇操作 (1-6): ").strip()
         
-        if choice == '1':
-            diagnostic.run_full_diagnostic()
-        elif choice == '2':
-            diagnostic.check_environment()
-        elif choice == '3':
-            diagnostic.test_ocr_initialization()
-        elif choice == '4':
-            diagnostic.create_test_images()
-        elif choice == '5':
-            if diagnostic.ocr_engine is None:
-                print("請先初始化 OCR 引擎（選項 3）")
-            else:
-                results = diagnostic.test_ocr_recognition()
-                if results:
-                    diagnostic.generate_report(results)
-        elif choice == '6':
+        if choice not in actions:
+            print("無效選擇")
+            continue
+        
+        action = actions[choice]
+        if action is None:
             print("退出診斷工具")
             break
-        else:
-            print("無效選擇")
-
+        
+        action()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
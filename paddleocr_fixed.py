@@ -1,138 +1,431 @@
 # paddleocr_fixed.py - AI-Generated PaddleOCR Testing Demo Tools
 # 完整版配置化 OCR 處理器
+import io
 import os
+import sys
 import time
 import json
+import queue
+import hashlib
 import argparse
+import threading
 import configparser
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from itertools import count, islice
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable
 
 # 核心套件
 import cv2
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-from paddleocr import PaddleOCR
+from PIL import Image, ImageDraw
 
-# 文件處理
-import docx
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+# PADDLEOCR_FIXED_CACHE=1：模型已快取於本機時，略過每次啟動的模型來源連線檢查（需在匯入 paddleocr 前設定）
+if os.environ.get('PADDLEOCR_FIXED_CACHE') == '1':
+    os.environ.setdefault('PADDLE_PDX_DISABLE_MODEL_SOURCE_CHECK', 'True')
 
-# PDF 生成
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+# paddleocr 於第一次建立 OCR 引擎時才匯入；文件處理（docx）與 PDF 生成（reportlab）
+# 於 save_result_to_file 需要時才匯入，縮短啟動時間
+
+# 選用：Numba JIT 加速信心度過濾
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _confidence_mask(scores, threshold):
+        """回傳信心度不低於閾值的布林遮罩"""
+        mask = np.empty(scores.shape[0], dtype=np.bool_)
+        for i in range(scores.shape[0]):
+            mask[i] = scores[i] >= threshold
+        return mask
+else:
+    def _confidence_mask(scores, threshold):
+        """回傳信心度不低於閾值的布林遮罩"""
+        return scores >= threshold
+
+
+# PDF 段落的 HTML 跳脫表（單次 translate 取代多次 replace）
+_PDF_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# 預設配置（配置檔案不存在時寫出）
+DEFAULT_CONFIG: Dict[str, Dict[str, str]] = {
+    'OCR': {
+        'lang': 'chinese_cht',
+        'use_angle_cls': 'True',
+        'use_gpu': 'False',
+        'show_log': 'False',
+        'enable_mkldnn': 'True',
+        'cpu_threads': '0',
+        'det_limit_side_len': '960',
+        'rec_batch_num': '6',
+        'cls_batch_num': '6',
+        'precision': 'fp32',
+        'use_tensorrt': 'False',
+        'backend': 'paddle',
+        'opencv_threads': '2',
+        'warmup': 'True'
+    },
+    'PROCESSING': {
+        'confidence_threshold': '0.9',
+        'default_output_format': 'pdf',
+        'batch_size': '6',
+        'workers': '1',
+        'max_wait_ms': '200',
+        'prefetch': '0',
+        'max_image_side': '1600',
+        'uniform_size': 'False',
+        'uniform_width': '1280',
+        'uniform_height': '960',
+        'size_bucket_px': '64',
+        'cache_results': 'False'
+    },
+    'OUTPUT': {
+        'output_folder': './output',
+        'include_stats': 'False',
+        'save_raw_results': 'False',
+        'simple_output': 'True',
+        'combine_batch_output': 'False'
+    }
+}
+
+
+@dataclass
+class _RuntimeConfig:
+    """處理過程中頻繁讀取的配置值（已轉型），避免每張圖片重複查詢 ConfigParser"""
+    lang: str
+    use_angle_cls: bool
+    use_gpu: bool
+    confidence_threshold: float
+    default_output_format: str
+    batch_size: int
+    max_wait_ms: int
+    max_image_side: int
+    cache_results: bool
+    output_folder: str
+    include_stats: bool
+    save_raw_results: bool
+    simple_output: bool
+    
+    @classmethod
+    def from_processor(cls, processor: 'OptimizedOCRProcessor') -> '_RuntimeConfig':
+        """依處理器目前的配置建立（無效值沿用預設值）"""
+        get = processor.get_config_value
+        return cls(
+            lang=get('OCR', 'lang', 'chinese_cht'),
+            use_angle_cls=get('OCR', 'use_angle_cls', True, bool),
+            use_gpu=get('OCR', 'use_gpu', False, bool),
+            confidence_threshold=get('PROCESSING', 'confidence_threshold', 0.9, float),
+            default_output_format=get('PROCESSING', 'default_output_format', 'pdf'),
+            batch_size=get('PROCESSING', 'batch_size', 6, int),
+            max_wait_ms=get('PROCESSING', 'max_wait_ms', 200, int),
+            max_image_side=get('PROCESSING', 'max_image_side', 1600, int),
+            cache_results=get('PROCESSING', 'cache_results', False, bool),
+            output_folder=get('OUTPUT', 'output_folder', './output'),
+            include_stats=get('OUTPUT', 'include_stats', False, bool),
+            save_raw_results=get('OUTPUT', 'save_raw_results', False, bool),
+            simple_output=get('OUTPUT', 'simple_output', True, bool),
+        )
+
+
+@dataclass
+class _WriteContext:
+    """儲存單一結果檔所需的資訊（每次儲存只計算一次，供各格式的寫入方法共用）"""
+    result: Dict
+    format_type: str
+    output_path: str
+    file_name: str
+    processed_time: str
+    include_stats: bool
+    simple_output: bool
+
+
+@lru_cache(maxsize=4)
+def _format_processed_at(processed_at: datetime) -> Tuple[str, str]:
+    """回傳 (檔名用時間戳記, 顯示用處理時間)；批量處理整批共用同一時間，只需格式化一次"""
+    return processed_at.strftime("%Y%m%d_%H%M%S"), processed_at.strftime('%Y-%m-%d %H:%M:%S')
+
+
+@lru_cache(maxsize=1)
+def _paddleocr_version() -> str:
+    """已安裝的 paddleocr 版本（作為結果快取鍵的一部分，升級後不沿用舊結果）"""
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        return version('paddleocr')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+@lru_cache(maxsize=8)
+def _parse_config_file(config_file: str, mtime_ns: int) -> Dict[str, Dict[str, str]]:
+    """解析配置檔案為 {區段: {鍵: 值}}；以修改時間為快取鍵，同一程序內重複建立處理器時不必重新解析"""
+    parser = configparser.ConfigParser()
+    parser.read(config_file, encoding='utf-8')
+    return {section: dict(parser.items(section, raw=True)) for section in parser.sections()}
+
+
+# 支援的圖片格式（副檔名，小寫不含點）
+SUPPORTED_IMAGE_EXTS = frozenset({'jpg', 'jpeg', 'png', 'bmp', 'tiff', 'gif'})
+
+# 串流寫出 PDF 時每次補充的內容元素數量（約一頁）
+_PDF_FLOWABLE_CHUNK = 64
+
+
+def _write_pdf(output_path: str, flowables: Iterable) -> None:
+    """逐頁將內容元素排入 A4 頁面並寫出 PDF，只保留目前頁面所需的元素於記憶體
+    
+    版面與分頁規則與 SimpleDocTemplate 相同（四邊 1 英吋邊界，頁尾放不下的段落拆到下一頁）
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.pdfgen import canvas
+    from reportlab.platypus import Frame, PageBreak
+    from reportlab.platypus.doctemplate import LayoutError
+    
+    page_width, page_height = A4
+    canv = canvas.Canvas(output_path, pagesize=A4)
+    flowables = iter(flowables)
+    pending = deque()
+    exhausted = False
+    
+    while not exhausted:
+        frame = Frame(inch, inch, page_width - 2 * inch, page_height - 2 * inch)
+        page_empty = True
+        
+        # 持續排入元素直到頁面排滿或內容結束
+        while True:
+            if not pending:
+                pending.extend(islice(flowables, _PDF_FLOWABLE_CHUNK))
+                if not pending:
+                    exhausted = True
+                    break
+            flowable = pending.popleft()
+            
+            if isinstance(flowable, PageBreak):
+                # 頁面仍空白時略過分頁，避免產生空白頁
+                if page_empty:
+                    continue
+                break
+            
+            if frame.add(flowable, canv, trySplit=1):
+                page_empty = False
+                continue
+            
+            # 放不下時先嘗試拆開，能放入本頁的部分留在本頁，其餘排到下一頁
+            pieces = frame.split(flowable, canv)
+            if pieces:
+                # 與 BaseDocTemplate 相同，拆出的第一部分必須放得進本頁，否則視為拆分失敗以免無限循環
+                if not frame.add(pieces[0], canv):
+                    raise LayoutError(f"內容元素 {flowable.__class__.__name__} 拆分後仍無法放入頁面")
+                page_empty = False
+                pending.extendleft(reversed(pieces[1:]))
+                continue
+            
+            if page_empty:
+                # 整頁都放不下且無法拆開，繼續換頁只會無限產生空白頁
+                raise LayoutError(f"內容元素 {flowable.__class__.__name__} 超出整頁大小且無法拆分")
+            pending.appendleft(flowable)
+            break
+        
+        if not exhausted:
+            canv.showPage()
+    
+    canv.save()
+
+
+# 支援中文的字體（依優先順序）
+CHINESE_FONT_PATHS = (
+    "C:/Windows/Fonts/msjh.ttc",    # 微軟正黑體（繁體）
+    "C:/Windows/Fonts/msyh.ttc",    # 微軟雅黑（簡體）
+    "C:/Windows/Fonts/simsun.ttc",  # 宋體
+)
+
+# 測試圖片用字體（中文字體之後再嘗試 Arial）
+TEST_IMAGE_FONT_PATHS = CHINESE_FONT_PATHS + (
+    "C:/Windows/Fonts/arial.ttf",   # Arial
+)
+
+
+@lru_cache(maxsize=4)
+def _existing_font_paths(font_paths: Tuple[str, ...]) -> Tuple[str, ...]:
+    """回傳存在於系統上的字體路徑（每組候選清單只檢查一次）"""
+    return tuple(font_path for font_path in font_paths if os.path.exists(font_path))
+
+
+@lru_cache(maxsize=1)
+def _register_chinese_font() -> Optional[str]:
+    """註冊 PDF 用的中文字體（每個程序只執行一次），成功時回傳字體名稱"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    
+    try:
+        for font_path in _existing_font_paths(CHINESE_FONT_PATHS):
+            pdfmetrics.registerFont(TTFont('Chinese', font_path))
+            return 'Chinese'
+    except:
+        pass
+    return None
 
 
 class PaddleOCRResultParser:
     """PaddleOCR 結果解析器 - 適配新版 API"""
     
     @staticmethod
-    def extract_text_from_result(result) -> Tuple[str, List[Dict]]:
-        """從新版 PaddleOCR 結果中提取文字"""
+    def extract_text_from_result(result, confidence_threshold: Optional[float] = None) -> Tuple[str, List[Dict], List[Dict], np.ndarray]:
+        """從新版 PaddleOCR 結果中提取文字，並在同一次走訪中依信心度過濾
+        
+        回傳 (全部文字, 全部結果, 過濾後結果, 過濾後信心度陣列)；未指定閾值時不過濾。
+        通過過濾的結果以 int32 陣列保存 bbox（四捨五入後的像素座標），寫入檔案時才轉為文字；其餘保留原始陣列。
+        """
         text_lines = []
         detailed_results = []
+        filtered_results = []
+        accepted_scores = np.empty(0, dtype=np.float64)
         
         try:
             if isinstance(result, list) and len(result) > 0:
-                # 新版返回 OCRResult 物件
+                # 新版返回 OCRResult 物件（字典子類別）；只判斷一次型別，不重複探測屬性
                 ocr_result = result[0]
                 
-                # 檢查是否有 rec_texts 屬性（識別的文字）
-                if hasattr(ocr_result, 'rec_texts') and ocr_result.rec_texts:
-                    texts = ocr_result.rec_texts
-                    scores = getattr(ocr_result, 'rec_scores', [1.0] * len(texts))
-                    polys = getattr(ocr_result, 'rec_polys', [None] * len(texts))
+                if isinstance(ocr_result, dict):
+                    texts = ocr_result.get('rec_texts')
+                    scores = ocr_result.get('rec_scores')
+                    polys = ocr_result.get('rec_polys')
+                else:
+                    # 以屬性提供結果的物件（向後兼容）
+                    texts = getattr(ocr_result, 'rec_texts', None)
+                    scores = getattr(ocr_result, 'rec_scores', None)
+                    polys = getattr(ocr_result, 'rec_polys', None)
+                
+                if texts:
+                    count = len(texts)
                     
-                    for i, text in enumerate(texts):
-                        confidence = scores[i] if i < len(scores) else 1.0
+                    # 信心度不足的部分補 1.0，座標不足的部分補 None
+                    score_array = np.ones(count, dtype=np.float64)
+                    if scores is not None:
+                        known = np.asarray(scores, dtype=np.float64)[:count]
+                        score_array[:len(known)] = known
+                    
+                    if polys is None:
+                        polys = []
+                    
+                    if confidence_threshold is None:
+                        mask = np.ones(count, dtype=np.bool_)
+                    else:
+                        mask = _confidence_mask(score_array, float(confidence_threshold))
+                    
+                    for i, (text, confidence, accepted) in enumerate(zip(texts, score_array.tolist(), mask.tolist())):
                         poly = polys[i] if i < len(polys) else None
                         
                         text_lines.append(text)
-                        detailed_results.append({
+                        item = {
                             'text': text,
                             'confidence': confidence,
-                            'bbox': poly.tolist() if poly is not None else None
-                        })
-                
-                # 如果是字典格式（向後兼容）
-                elif isinstance(ocr_result, dict):
-                    if 'rec_texts' in ocr_result and ocr_result['rec_texts']:
-                        texts = ocr_result['rec_texts']
-                        scores = ocr_result.get('rec_scores', [1.0] * len(texts))
-                        polys = ocr_result.get('rec_polys', [None] * len(texts))
+                            'bbox': np.rint(np.asarray(poly)).astype(np.int32) if accepted and poly is not None else poly
+                        }
+                        detailed_results.append(item)
                         
-                        for i, text in enumerate(texts):
-                            confidence = scores[i] if i < len(scores) else 1.0
-                            poly = polys[i] if i < len(polys) else None
-                            
-                            text_lines.append(text)
-                            detailed_results.append({
-                                'text': text,
-                                'confidence': confidence,
-                                'bbox': poly.tolist() if poly is not None else None
-                            })
+                        if accepted:
+                            filtered_results.append(item)
+                    
+                    accepted_scores = score_array[mask]
         
         except Exception as e:
             print(f"結果解析錯誤: {e}")
         
-        return '\n'.join(text_lines), detailed_results
+        return '\n'.join(text_lines), detailed_results, filtered_results, accepted_scores
 
 
 class OptimizedOCRProcessor:
     """AI-Generated PaddleOCR Testing Demo Tools - 核心處理器"""
     
-    def __init__(self, config_file: str = "paddleocr_config.ini"):
+    # 已建立的 OCR 引擎（同一程序內以相同配置重新初始化時直接重複使用）
+    _engine_cache: Dict[tuple, Tuple['PaddleOCR', Dict]] = {}
+    
+    # 已完成預熱的引擎（重複使用快取的引擎時不再預熱）
+    _warmed_engines: set = set()
+    
+    # 批量處理時平行產生 DOCX/PDF 的執行緒數
+    WRITER_POOL_SIZE = 4
+    
+    # 工作階段內保留的識別結果數（重複處理未變更的檔案時直接使用）
+    SESSION_RESULTS_SIZE = 128
+    
+    def __init__(self, config_file: str = "paddleocr_config.ini", config_overrides: Optional[Dict[str, Dict[str, str]]] = None,
+                 lazy: bool = False):
         self.config_file = config_file
         self.ocr_engine = None
+        self._predict_fn = None
+        self._batch_predict = False
+        self._engine_initialized = False
+        self._engine_messages: Optional[List[str]] = None
+        self._writer_pool = None
+        self._session_results: 'OrderedDict[tuple, Dict]' = OrderedDict()
         self.parser = PaddleOCRResultParser()
+        self._test_canvas = threading.local()
         self.config = self._load_config()
-        self._init_ocr_engine()
+        
+        # 覆蓋配置（例如命令列參數或批量處理的子程序）
+        for section, options in (config_overrides or {}).items():
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            for key, value in options.items():
+                self.config.set(section, key, value)
+        
+        self.cfg = _RuntimeConfig.from_processor(self)
+        
+        # lazy=True 時延後到第一次識別才載入模型（例如只顯示配置時不需要引擎）
+        if not lazy:
+            self._init_ocr_engine()
         print("✓ AI-Generated PaddleOCR Testing Demo Tools 已初始化")
     
+    def ensure_ocr_engine(self, quiet: bool = False):
+        """確保 OCR 引擎已初始化（只嘗試一次），回傳引擎或 None
+        
+        quiet=True 時先暫存初始化訊息（例如在背景執行緒載入時避免與選單輸出交錯），由 flush_engine_messages 輸出
+        """
+        if not self._engine_initialized:
+            if quiet:
+                self._engine_messages = []
+            self._init_ocr_engine()
+        return self.ocr_engine
+    
+    def flush_engine_messages(self):
+        """輸出暫存的引擎初始化訊息並停止暫存"""
+        messages, self._engine_messages = self._engine_messages, None
+        if messages:
+            sys.stdout.write(''.join(f"{message}\n" for message in messages))
+    
+    def _engine_log(self, message: str):
+        """輸出引擎初始化訊息（暫存中時先保留）"""
+        if self._engine_messages is not None:
+            self._engine_messages.append(message)
+        else:
+            print(message)
+    
     def _load_config(self):
         """載入配置檔案"""
         config = configparser.ConfigParser()
         
-        # 預設配置
-        default_config = {
-            'OCR': {
-                'lang': 'chinese_cht',
-                'use_angle_cls': 'True',
-                'use_gpu': 'False',
-                'show_log': 'False'
-            },
-            'PROCESSING': {
-                'confidence_threshold': '0.9',
-                'default_output_format': 'pdf'
-            },
-            'OUTPUT': {
-                'output_folder': './output',
-                'include_stats': 'False',
-                'save_raw_results': 'False',
-                'simple_output': 'True'
-            }
-        }
-        
         # 如果配置檔案存在，讀取它
         if os.path.exists(self.config_file):
             try:
-                config.read(self.config_file, encoding='utf-8')
+                config.read_dict(_parse_config_file(self.config_file, os.stat(self.config_file).st_mtime_ns))
                 print(f"✓ 載入配置檔案: {self.config_file}")
             except Exception as e:
                 print(f"✗ 配置檔案讀取失敗: {e}")
                 print("使用預設配置")
         else:
             # 創建預設配置檔案
-            for section, options in default_config.items():
-                config.add_section(section)
-                for key, value in options.items():
-                    config.set(section, key, value)
+            config.read_dict(DEFAULT_CONFIG)
             
             try:
                 with open(self.config_file, 'w', encoding='utf-8') as f:
@@ -143,6 +436,60 @@ class OptimizedOCRProcessor:
         
         return config
     
+    def set_config_value(self, section: str, key: str, value: str):
+        """修改配置值並同步更新 self.cfg"""
+        if not self.config.has_section(section):
+            self.config.add_section(section)
+        self.config.set(section, key, value)
+        self.cfg = _RuntimeConfig.from_processor(self)
+    
+    def save_config_values(self, section: str, values: Dict[str, str]) -> bool:
+        """將配置值寫回配置檔案；只改寫對應的設定行，保留註解、換行格式與其他設定"""
+        try:
+            with open(self.config_file, encoding='utf-8', newline='') as f:
+                lines = f.read().splitlines(keepends=True)
+        except OSError:
+            lines = []
+        
+        newline = '\r\n' if lines and lines[0].endswith('\r\n') else '\n'
+        remaining = dict(values)
+        in_section = False
+        insert_at = None
+        
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                if in_section:
+                    break
+                in_section = stripped[1:-1] == section
+                if in_section:
+                    insert_at = i + 1
+                continue
+            
+            if in_section and stripped and not stripped.startswith(('#', ';')):
+                key = stripped.partition('=')[0].strip()
+                if key in remaining:
+                    lines[i] = f"{key} = {remaining.pop(key)}{newline}"
+                insert_at = i + 1
+        
+        # 配置檔案中沒有的設定加在區段最後（沒有此區段時新增區段）
+        if remaining:
+            if lines and not lines[-1].endswith(('\r', '\n')):
+                lines[-1] += newline
+            if insert_at is None:
+                lines.append(f"{newline}[{section}]{newline}")
+                insert_at = len(lines)
+            lines[insert_at:insert_at] = [f"{key} = {value}{newline}" for key, value in remaining.items()]
+        
+        try:
+            with open(self.config_file, 'w', encoding='utf-8', newline='') as f:
+                f.writelines(lines)
+            print(f"✓ 已儲存至配置檔案: {self.config_file}")
+            return True
+        except Exception as e:
+            print(f"✗ 配置檔案儲存失敗: {e}")
+            return False
+    
     def get_config_value(self, section: str, key: str, fallback=None, value_type=str):
         """安全獲取配置值"""
         try:
@@ -159,12 +506,13 @@ class OptimizedOCRProcessor:
     
     def _init_ocr_engine(self):
         """根據配置初始化 OCR 引擎"""
+        self._engine_initialized = True
         try:
-            print("正在初始化 PaddleOCR 引擎...")
+            self._engine_log("正在初始化 PaddleOCR 引擎...")
             
             # 從配置檔案獲取參數
             ocr_config = {}
-            lang = self.get_config_value('OCR', 'lang', 'chinese_cht')
+            lang = self.cfg.lang
             
             # 語言映射和驗證
             supported_langs = {
@@ -178,19 +526,28 @@ class OptimizedOCRProcessor:
             # 標準化語言代碼
             if lang in ['chinese_cht', 'chinese_traditional', 'cht']:
                 ocr_config['lang'] = 'chinese_cht'
-                print(f"✓ 使用繁體中文模型")
+                self._engine_log(f"✓ 使用繁體中文模型")
             elif lang == 'ch':
                 ocr_config['lang'] = 'ch'
-                print(f"✓ 使用簡體中文模型")
+                self._engine_log(f"✓ 使用簡體中文模型")
             elif lang == 'en':
                 ocr_config['lang'] = 'en'
-                print(f"✓ 使用英文模型")
+                self._engine_log(f"✓ 使用英文模型")
             else:
-                print(f"⚠️ 不支援的語言: {lang}，使用預設繁體中文")
+                self._engine_log(f"⚠️ 不支援的語言: {lang}，使用預設繁體中文")
                 ocr_config['lang'] = 'chinese_cht'
             
-            ocr_config['use_angle_cls'] = self.get_config_value('OCR', 'use_angle_cls', True, bool)
-            ocr_config['use_gpu'] = self.get_config_value('OCR', 'use_gpu', False, bool)
+            ocr_config['use_angle_cls'] = self.cfg.use_angle_cls
+            ocr_config['use_gpu'] = self.cfg.use_gpu
+            
+            # 限制 OpenCV 執行緒數，避免與 Paddle 推理執行緒互相搶占 CPU（0 = OpenCV 預設）
+            opencv_threads = self.get_config_value('OCR', 'opencv_threads', 2, int)
+            if opencv_threads > 0:
+                cv2.setNumThreads(opencv_threads)
+            
+            # GPU 記憶體依需求逐步配置（須在載入 paddle 之前設定，已設定時不覆蓋）
+            if self.cfg.use_gpu:
+                os.environ.setdefault('FLAGS_allocator_strategy', 'auto_growth')
             
             # show_log 在新版本可能不支援，所以先嘗試
             try:
@@ -199,7 +556,29 @@ class OptimizedOCRProcessor:
             except:
                 pass
             
-            print(f"使用配置: {ocr_config}")
+            # CPU 推理效能調校（MKL-DNN 多核心運算、執行緒數、偵測輸入邊長上限）
+            ocr_config['enable_mkldnn'] = self.get_config_value('OCR', 'enable_mkldnn', True, bool)
+            ocr_config['cpu_threads'] = self.get_config_value('OCR', 'cpu_threads', 0, int) or os.cpu_count() or 1
+            ocr_config['det_limit_side_len'] = self.get_config_value('OCR', 'det_limit_side_len', 960, int)
+            
+            # 識別與方向分類模型的內部批次大小（批量處理時一次處理更多文字區塊）
+            ocr_config['rec_batch_num'] = self.get_config_value('OCR', 'rec_batch_num', 6, int)
+            ocr_config['cls_batch_num'] = self.get_config_value('OCR', 'cls_batch_num', 6, int)
+            
+            # GPU 推理精度與 TensorRT（僅在使用 GPU 時生效；fp16 需 Pascal 以上架構）
+            if ocr_config['use_gpu']:
+                ocr_config['precision'] = self.get_config_value('OCR', 'precision', 'fp32')
+                ocr_config['use_tensorrt'] = self.get_config_value('OCR', 'use_tensorrt', False, bool)
+            
+            # 高效能推理後端：由 PaddleOCR 自動選用 ONNX Runtime / TensorRT / OpenVINO
+            if self.get_config_value('OCR', 'backend', 'paddle').lower() in ('onnx', 'hpi'):
+                ocr_config['enable_hpi'] = True
+            
+            # 不同版本可能不支援的參數（依加入順序，失敗時由後往前移除）
+            optional_keys = ['show_log', 'enable_mkldnn', 'cpu_threads', 'det_limit_side_len',
+                             'rec_batch_num', 'cls_batch_num', 'precision', 'use_tensorrt', 'enable_hpi']
+            
+            self._engine_log(f"使用配置: {ocr_config}")
             
             # 備用配置（如果配置檔案失敗）
             configs_to_try = [
@@ -210,126 +589,589 @@ class OptimizedOCRProcessor:
             ]
             
             for i, config in enumerate(configs_to_try):
-                try:
-                    print(f"嘗試配置 {i+1}: {config}")
-                    self.ocr_engine = PaddleOCR(**config)
+                self._engine_log(f"嘗試配置 {i+1}: {config}")
+                config = self._try_create_engine(config, optional_keys)
+                
+                if self.ocr_engine is not None:
                     self.current_config = config
-                    print(f"✓ 成功初始化，配置: {config}")
+                    
+                    # 新版使用 predict（支援批次輸入），舊版只有 ocr；只判斷一次
+                    predict = getattr(self.ocr_engine, 'predict', None)
+                    self._batch_predict = predict is not None
+                    self._predict_fn = predict or self.ocr_engine.ocr
+                    self._engine_log(f"✓ 成功初始化，配置: {config}")
                     
                     # 顯示當前使用的語言
                     used_lang = config.get('lang', 'unknown')
                     if used_lang in supported_langs:
-                        print(f"✓ 當前語言模型: {supported_langs[used_lang]}")
+                        self._engine_log(f"✓ 當前語言模型: {supported_langs[used_lang]}")
                     
                     break
-                except Exception as e:
-                    print(f"✗ 配置失敗: {e}")
-                    if 'chinese_cht' in str(config) and 'not found' in str(e).lower():
-                        print("  💡 提示：可能需要下載繁體中文模型")
             
             if self.ocr_engine is None:
                 raise Exception("所有配置都失敗")
             
+            if self.get_config_value('OCR', 'warmup', True, bool):
+                self._warm_up_engine()
+            
         except Exception as e:
-            print(f"OCR 初始化失敗: {e}")
+            self._engine_log(f"OCR 初始化失敗: {e}")
             self.ocr_engine = None
     
-    def process_image(self, image_path: str, confidence_threshold: float = None) -> Dict:
-        """處理圖片檔案"""
+    def _warm_up_engine(self):
+        """以合成圖片執行一次識別，讓首張圖片不必負擔模型初始化與核心選擇的延遲"""
+        if self.ocr_engine in self._warmed_engines:
+            return
+        
+        start_time = time.perf_counter()
+        image = np.full((160, 640, 3), 255, dtype=np.uint8)
+        cv2.putText(image, "Warm up 123", (20, 110), cv2.FONT_HERSHEY_SIMPLEX, 2.5, (0, 0, 0), 5)
+        
+        # 批量處理補邊成相同尺寸時，以相同的輸入形狀預熱
+        if self.get_config_value('PROCESSING', 'uniform_size', False, bool):
+            image, _ = self._letterbox(image,
+                                       self.get_config_value('PROCESSING', 'uniform_width', 1280, int),
+                                       self.get_config_value('PROCESSING', 'uniform_height', 960, int))
+        
+        try:
+            self._predict_fn(image)
+        except Exception as e:
+            self._engine_log(f"⚠️ 模型預熱失敗: {e}")
+            return
+        
+        self._warmed_engines.add(self.ocr_engine)
+        if not self.cfg.simple_output:
+            self._engine_log(f"✓ 模型預熱完成 ({time.perf_counter() - start_time:.2f} 秒)")
+    
+    def _try_create_engine(self, config: Dict, optional_keys: List[str]) -> Dict:
+        """嘗試建立 PaddleOCR 引擎，失敗時逐一移除最後加入的可選參數並重試，回傳實際使用的配置"""
+        from paddleocr import PaddleOCR
+        
+        key = tuple(sorted(config.items()))
+        cached = self._engine_cache.get(key)
+        if cached is not None:
+            self.ocr_engine, used_config = cached
+            self._engine_log("✓ 重複使用已建立的 OCR 引擎")
+            return dict(used_config)
+        
+        config = dict(config)
+        
+        while True:
+            try:
+                self.ocr_engine = PaddleOCR(**config)
+                self._engine_cache[key] = (self.ocr_engine, dict(config))
+                return config
+            except Exception as e:
+                self._engine_log(f"✗ 配置失敗: {e}")
+                if 'chinese_cht' in str(config) and 'not found' in str(e).lower():
+                    self._engine_log("  💡 提示：可能需要下載繁體中文模型")
+                
+                removable = [key for key in optional_keys if key in config]
+                if not removable:
+                    self.ocr_engine = None
+                    return config
+                
+                self._engine_log(f"  移除參數 {removable[-1]} 後重試")
+                config.pop(removable[-1])
+    
+    def process_image(self, image_path: str, confidence_threshold: float = None,
+                      image_bytes: Optional[np.ndarray] = None) -> Dict:
+        """處理圖片檔案；image_bytes 為已預先讀取的檔案內容（未提供時讀取 image_path）"""
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"找不到圖片檔案: {image_path}")
         
-        if self.ocr_engine is None:
+        # 先載入引擎：快取鍵包含實際使用的引擎配置（lazy 模式下載入前尚未決定）
+        if self.ensure_ocr_engine() is None:
+            raise RuntimeError("PaddleOCR 引擎未初始化")
+        
+        if confidence_threshold is None:
+            confidence_threshold = self.cfg.confidence_threshold
+        
+        try:
+            # 載入圖片
+            buf = image_bytes if image_bytes is not None else self._read_image_bytes(image_path)
+            
+            # 相同內容與配置的圖片直接使用先前的結果
+            cache_key = self._result_cache_key(buf, confidence_threshold)
+            cached = self._load_cached_result(cache_key)
+            if cached is not None:
+                self._print_if_verbose(f"✓ 使用快取結果: {image_path}")
+                self._print_result_summary(cached, self.cfg.simple_output)
+                return cached
+        except Exception as e:
+            raise Exception(f"圖片處理失敗: {e}")
+        
+        # 解碼結果直接交給 process_image_array，不在此保留參照，識別完成後即可釋放
+        result = self.process_image_array(self._decode_image_checked(buf), confidence_threshold, image_path)
+        self._store_cached_result(cache_key, result)
+        return result
+    
+    def process_image_array(self, image: np.ndarray, confidence_threshold: float = None, source: str = "記憶體圖片") -> Dict:
+        """處理已載入的 BGR 圖片陣列（不經過檔案讀取與解碼）"""
+        if self.ensure_ocr_engine() is None:
             raise RuntimeError("PaddleOCR 引擎未初始化")
         
         # 如果沒有指定信心度閾值，使用配置檔案中的值
         if confidence_threshold is None:
-            confidence_threshold = self.get_config_value('PROCESSING', 'confidence_threshold', 0.9, float)
+            confidence_threshold = self.cfg.confidence_threshold
         
         # 檢查是否為簡單輸出模式
-        simple_output = self.get_config_value('OUTPUT', 'simple_output', True, bool)
+        simple_output = self.cfg.simple_output
         
         if not simple_output:
-            print(f"開始處理圖片: {image_path}")
+            print(f"開始處理圖片: {source}")
             print(f"使用信心度閾值: {confidence_threshold}")
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            # 載入圖片
-            image = cv2.imread(image_path)
-            if image is None:
-                pil_image = Image.open(image_path)
-                image = np.array(pil_image)
-                if len(image.shape) == 3:
-                    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            # 過大時先縮小，座標於解析後還原
+            image, scale = self._downscale_image(image)
             
             # 執行 OCR
             self._print_if_verbose("正在執行 OCR 識別...")
             
-            try:
-                results = self.ocr_engine.predict(image)
-            except AttributeError:
-                results = self.ocr_engine.ocr(image)
+            results = self._predict_fn(image)
+            
+            # 識別完成後不再需要圖片（縮小後的副本可在解析前先釋放）
+            del image
             
-            end_time = time.time()
+            end_time = time.perf_counter()
             processing_time = end_time - start_time
             
-            # 解析結果
-            text_content, detailed_results = self.parser.extract_text_from_result(results)
-            
-            # 過濾低信心度結果
-            filtered_results = []
-            filtered_text_lines = []
-            
-            for result in detailed_results:
-                if result['confidence'] >= confidence_threshold:
-                    filtered_results.append(result)
-                    filtered_text_lines.append(result['text'])
-            
-            filtered_text = '\n'.join(filtered_text_lines)
-            
-            # 統計資訊
-            stats = {
-                'processing_time': f"{processing_time:.2f} 秒",
-                'total_detected': len(detailed_results),
-                'accepted_lines': len(filtered_results),
-                'total_chars': len(filtered_text),
-                'total_words': len(filtered_text.split()),
-                'confidence_threshold': confidence_threshold,
-                'average_confidence': sum(r['confidence'] for r in filtered_results) / len(filtered_results) if filtered_results else 0
-            }
+            result = self._build_result(results, confidence_threshold, processing_time, scale)
+            self._print_result_summary(result, simple_output)
+            return result
             
-            # 根據模式顯示結果
-            if simple_output:
-                # 只顯示 OCR 結果
-                self._print_ocr_result_only({'text_content': filtered_text})
+        except Exception as e:
+            raise Exception(f"圖片處理失敗: {e}")
+    
+    def process_image_memoized(self, image_path: str, confidence_threshold: float = None,
+                               image_bytes: Optional[np.ndarray] = None) -> Dict:
+        """處理圖片檔案；同一工作階段內檔案（修改時間、大小）、閾值與配置皆未變更時直接回傳先前的結果"""
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"找不到圖片檔案: {image_path}")
+        
+        # 鍵中的配置指紋包含引擎配置，須在引擎載入後計算
+        if self.ensure_ocr_engine() is None:
+            raise RuntimeError("PaddleOCR 引擎未初始化")
+        
+        if confidence_threshold is None:
+            confidence_threshold = self.cfg.confidence_threshold
+        
+        stat = os.stat(image_path)
+        key = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, confidence_threshold,
+               self.config_fingerprint())
+        
+        result = self._session_results.get(key)
+        if result is not None:
+            self._session_results.move_to_end(key)
+            self._print_if_verbose(f"✓ 檔案與配置未變更，使用先前的結果: {image_path}")
+            self._print_result_summary(result, self.cfg.simple_output)
+            return result
+        
+        result = self.process_image(image_path, confidence_threshold, image_bytes)
+        self._session_results[key] = result
+        if len(self._session_results) > self.SESSION_RESULTS_SIZE:
+            self._session_results.popitem(last=False)
+        return result
+    
+    def process_image_arrays(self, images: List[np.ndarray], confidence_threshold: float = None) -> List:
+        """以單次 predict 處理多張已載入的 BGR 圖片陣列，依序回傳結果字典或例外（不顯示識別結果）
+        
+        啟用 cache_results 時以圖片像素內容為快取鍵，命中的圖片不再識別
+        """
+        if self.ensure_ocr_engine() is None:
+            raise RuntimeError("PaddleOCR 引擎未初始化")
+        
+        if confidence_threshold is None:
+            confidence_threshold = self.cfg.confidence_threshold
+        
+        pending = []
+        for i, image in enumerate(images):
+            cache_key = self._result_cache_key(np.ascontiguousarray(image), confidence_threshold)
+            cached = self._load_cached_result(cache_key)
+            if cached is not None:
+                pending.append((i, cached, 1.0, None))
             else:
-                # 顯示詳細信息
-                print(f"✓ OCR 完成")
-                print(f"  檢測到: {stats['total_detected']} 行")
-                print(f"  接受: {stats['accepted_lines']} 行")
-                print(f"  字符數: {stats['total_chars']}")
-                print(f"  平均信心度: {stats['average_confidence']:.3f}")
+                pending.append((i, *self._downscale_image(image), cache_key))
+        
+        return [result for _, result in self._recognize_pending(pending, confidence_threshold)]
+    
+    def _load_image(self, image_path: str) -> np.ndarray:
+        """載入圖片為 BGR 陣列（檔案直接讀入 NumPy 緩衝區只讀取一次，支援非 ASCII 路徑）"""
+        return self._decode_image(self._read_image_bytes(image_path))
+    
+    def _read_image_bytes(self, image_path: str) -> np.ndarray:
+        """讀取圖片檔案的原始位元組"""
+        return np.fromfile(image_path, dtype=np.uint8)
+    
+    def _decode_image(self, buf: np.ndarray) -> np.ndarray:
+        """將圖片檔案位元組解碼為 BGR 陣列"""
+        image = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+        
+        if image is None:
+            # OpenCV 無法解碼的格式（例如 GIF）改用 PIL：統一轉為 RGB 後就地轉成 BGR，只配置一次記憶體
+            pil_image = Image.open(io.BytesIO(buf))
+            if pil_image.mode != 'RGB':
+                pil_image = pil_image.convert('RGB')
+            image = np.array(pil_image)
+            cv2.cvtColor(image, cv2.COLOR_RGB2BGR, dst=image)
+        
+        return image
+    
+    def _decode_image_checked(self, buf: np.ndarray) -> np.ndarray:
+        """解碼圖片檔案位元組，失敗時與讀取錯誤相同以「圖片處理失敗」回報"""
+        try:
+            return self._decode_image(buf)
+        except Exception as e:
+            raise Exception(f"圖片處理失敗: {e}")
+    
+    def _downscale_image(self, image: np.ndarray) -> Tuple[np.ndarray, float]:
+        """最長邊超過 max_image_side 時以 INTER_AREA 縮小，回傳 (圖片, 縮放比例)"""
+        max_side = self.cfg.max_image_side
+        height, width = image.shape[:2]
+        
+        if max_side <= 0 or max(height, width) <= max_side:
+            return image, 1.0
+        
+        scale = max_side / max(height, width)
+        return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA), scale
+    
+    def _result_cache_key(self, buf: np.ndarray, confidence_threshold: float) -> Optional[str]:
+        """計算結果快取鍵（圖片內容 SHA-256 加上影響結果的配置），未啟用 cache_results 時回傳 None"""
+        if not self.cfg.cache_results:
+            return None
+        
+        digest = hashlib.sha256(buf)
+        digest.update(repr((self.config_fingerprint(), confidence_threshold)).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def config_fingerprint(self) -> str:
+        """影響識別結果的配置（引擎參數、paddleocr 版本與前處理設定），供結果快取比對"""
+        return repr((
+            _paddleocr_version(),
+            sorted(getattr(self, 'current_config', {}).items()),
+            self.cfg.max_image_side,
+            self.get_config_value('PROCESSING', 'uniform_size', False, bool),
+            self.get_config_value('PROCESSING', 'uniform_width', 1280, int),
+            self.get_config_value('PROCESSING', 'uniform_height', 960, int),
+        ))
+    
+    def _result_cache_dir(self) -> Path:
+        """結果快取資料夾（位於輸出資料夾內）"""
+        return Path(self.cfg.output_folder) / '.ocr_cache'
+    
+    def _load_cached_result(self, cache_key: Optional[str]) -> Optional[Dict]:
+        """讀取快取的結果（JSON，只含資料，不執行任何程式碼），不存在或讀取失敗時回傳 None"""
+        if cache_key is None:
+            return None
+        try:
+            with open(self._result_cache_dir() / f"{cache_key}.json", encoding='utf-8') as f:
+                cached = json.load(f)
+            
+            all_results = [
+                {'text': text, 'confidence': confidence, 'bbox': None if bbox is None else np.asarray(bbox)}
+                for text, confidence, bbox in cached['rows']
+            ]
+            accepted = cached['accepted']
+            for i in accepted:
+                if all_results[i]['bbox'] is not None:
+                    all_results[i]['bbox'] = all_results[i]['bbox'].astype(np.int32)
+            
+            # 與 _build_result 相同：沒有任何結果被過濾時兩份清單共用同一個清單
+            detailed_results = all_results if len(accepted) == len(all_results) else [all_results[i] for i in accepted]
             
             return {
-                'text_content': filtered_text,
-                'all_text': text_content,
-                'detailed_results': filtered_results,
-                'all_results': detailed_results,
-                'stats': stats,
-                'raw_ocr_result': results if self.get_config_value('OUTPUT', 'save_raw_results', False, bool) else None
+                'text_content': cached['text_content'],
+                'all_text': cached['all_text'],
+                'detailed_results': detailed_results,
+                'all_results': all_results,
+                'stats': cached['stats'],
+                'raw_ocr_result': None
+            }
+        except Exception:
+            return None
+    
+    def _store_cached_result(self, cache_key: Optional[str], result: Dict):
+        """以 JSON 寫入結果快取（文字、信心度、座標與統計，不包含原始 OCR 結果），寫入失敗時忽略"""
+        if cache_key is None:
+            return
+        try:
+            all_results = result['all_results']
+            index_of = {id(item): i for i, item in enumerate(all_results)}
+            cached = {
+                'text_content': result['text_content'],
+                'all_text': result['all_text'],
+                'rows': [
+                    [item['text'], item['confidence'], None if item['bbox'] is None else np.asarray(item['bbox']).tolist()]
+                    for item in all_results
+                ],
+                'accepted': [index_of[id(item)] for item in result['detailed_results']],
+                'stats': result['stats'],
             }
             
-        except Exception as e:
-            raise Exception(f"圖片處理失敗: {e}")
+            cache_dir = self._result_cache_dir()
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_dir / f"{cache_key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cached, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_dir / f"{cache_key}.json")
+        except Exception:
+            pass
+    
+    def _letterbox(self, image: np.ndarray, width: int, height: int,
+                   out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float]:
+        """等比例縮小至不超過 width×height，再於右方與下方補黑邊成固定尺寸，回傳 (圖片, 縮放比例)
+        
+        原點不變，座標只需除以縮放比例即可還原；提供 out（height×width×3 uint8）時直接寫入該緩衝區
+        """
+        h, w = image.shape[:2]
+        scale = min(1.0, width / w, height / h)
+        
+        if scale < 1.0:
+            new_w, new_h = min(width, max(1, round(w * scale))), min(height, max(1, round(h * scale)))
+        else:
+            new_w, new_h = w, h
+        
+        if out is None:
+            if scale < 1.0:
+                image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+            return cv2.copyMakeBorder(image, 0, height - new_h, 0, width - new_w, cv2.BORDER_CONSTANT, value=0), scale
+        
+        region = out[:new_h, :new_w]
+        if scale < 1.0:
+            cv2.resize(image, (new_w, new_h), dst=region, interpolation=cv2.INTER_AREA)
+        else:
+            region[...] = image
+        out[new_h:] = 0
+        out[:new_h, new_w:] = 0
+        return out, scale
+    
+    def _predict_batch(self, images: List[np.ndarray]) -> List:
+        """以單次 predict 批次識別多張圖片，回傳每張圖片各自的 OCR 結果"""
+        if not self._batch_predict:
+            # 舊版 API 不支援批次輸入
+            return [self._predict_fn(image) for image in images]
+        return [[result] for result in self._predict_fn(images)]
+    
+    def _build_result(self, results, confidence_threshold: float, processing_time: float, scale: float = 1.0) -> Dict:
+        """解析 OCR 結果、過濾低信心度並產生統計資訊；scale 為識別前的縮放比例"""
+        # 解析結果並過濾低信心度結果
+        text_content, detailed_results, filtered_results, accepted_scores = self.parser.extract_text_from_result(results, confidence_threshold)
+        
+        # 圖片曾被縮小時，將座標還原為原圖尺寸
+        if scale != 1.0:
+            for item in detailed_results:
+                if item['bbox'] is not None:
+                    item['bbox'] = np.rint(np.asarray(item['bbox']) / scale).astype(np.int32)
+        
+        accepted_lines = len(filtered_results)
+        
+        # 沒有任何結果被過濾時，兩份清單內容相同，直接共用同一個清單
+        if accepted_lines == len(detailed_results):
+            filtered_results = detailed_results
+        
+        filtered_text = '\n'.join(result['text'] for result in filtered_results)
+        
+        # 統計資訊
+        stats = {
+            'processing_time': f"{processing_time:.2f} 秒",
+            'total_detected': len(detailed_results),
+            'accepted_lines': accepted_lines,
+            'total_chars': len(filtered_text),
+            'total_words': len(filtered_text.split()),
+            'confidence_threshold': confidence_threshold,
+            'average_confidence': float(accepted_scores.mean()) if accepted_lines else 0
+        }
+        
+        return {
+            'text_content': filtered_text,
+            'all_text': text_content,
+            'detailed_results': filtered_results,
+            'all_results': detailed_results,
+            'stats': stats,
+            'raw_ocr_result': results if self.cfg.save_raw_results else None
+        }
+    
+    def _print_result_summary(self, result: Dict, simple_output: bool):
+        """根據模式顯示識別結果"""
+        if simple_output:
+            # 只顯示 OCR 結果
+            self._print_ocr_result_only(result)
+        else:
+            # 顯示詳細信息
+            stats = result['stats']
+            print(f"✓ OCR 完成")
+            print(f"  檢測到: {stats['total_detected']} 行")
+            print(f"  接受: {stats['accepted_lines']} 行")
+            print(f"  字符數: {stats['total_chars']}")
+            print(f"  平均信心度: {stats['average_confidence']:.3f}")
+    
+    def process_images_batched(self, image_paths: List[str], confidence_threshold: float = None,
+                               batch_size: int = None, max_wait_ms: int = None):
+        """以動態微批次識別多張圖片，依序逐一產生 (圖片檔案, 結果字典或例外)
+        
+        載入執行緒經由有界佇列逐張解碼；圖片依尺寸分組（size_bucket_px），
+        某一組累積 batch_size 張，或該組最早等待的圖片超過 max_wait_ms 時送出一次 predict，
+        同一批的圖片尺寸相近，減少補邊浪費的運算
+        """
+        if self.ensure_ocr_engine() is None:
+            raise RuntimeError("PaddleOCR 引擎未初始化")
+        
+        if confidence_threshold is None:
+            confidence_threshold = self.cfg.confidence_threshold
+        if batch_size is None:
+            batch_size = self.cfg.batch_size
+        if max_wait_ms is None:
+            max_wait_ms = self.cfg.max_wait_ms
+        batch_size = max(1, batch_size)
+        max_wait = max(0, max_wait_ms) / 1000
+        bucket_px = self.get_config_value('PROCESSING', 'size_bucket_px', 64, int)
+        
+        # 預先載入（已解碼、等待識別）的圖片數上限，0 = batch_size 的兩倍
+        prefetch = self.get_config_value('PROCESSING', 'prefetch', 0, int)
+        queue_size = prefetch if prefetch > 0 else batch_size * 2
+        
+        # uniform_size 啟用時所有圖片補邊成相同尺寸，讓同一批的偵測輸入形狀一致
+        if self.get_config_value('PROCESSING', 'uniform_size', False, bool):
+            width = self.get_config_value('PROCESSING', 'uniform_width', 1280, int)
+            height = self.get_config_value('PROCESSING', 'uniform_height', 960, int)
+            
+            if self.cfg.save_raw_results:
+                # 原始結果可能引用輸入圖片並於稍後寫出，不可重複使用緩衝區
+                prepare = lambda image: self._letterbox(image, width, height)
+            else:
+                # 預先配置環狀緩衝區，載入中、佇列中與等待識別的圖片各佔一格，格數足以避免覆寫仍在使用的圖片
+                slots = queue_size + batch_size + 1
+                scratch = np.empty((slots, height, width, 3), dtype=np.uint8)
+                slot_ids = count()
+                prepare = lambda image: self._letterbox(image, width, height, scratch[next(slot_ids) % slots])
+        else:
+            prepare = self._downscale_image
+        
+        q_load = queue.Queue(maxsize=queue_size)
+        
+        def load_images():
+            for image_file in image_paths:
+                try:
+                    buf = self._read_image_bytes(image_file)
+                    
+                    # 快取命中時直接傳遞結果，不再解碼與識別
+                    cache_key = self._result_cache_key(buf, confidence_threshold)
+                    cached = self._load_cached_result(cache_key)
+                    if cached is not None:
+                        q_load.put((image_file, cached, 1.0, None))
+                        continue
+                    
+                    q_load.put((image_file, *prepare(self._decode_image(buf)), cache_key))
+                except Exception as e:
+                    q_load.put((image_file, Exception(f"圖片處理失敗: {e}"), 1.0, None))
+            q_load.put(None)
+        
+        threading.Thread(target=load_images, name="ocr-loader", daemon=True).start()
+        
+        # 各尺寸組等待識別的 (序號, 項目) 與送出期限；不同組的批次完成順序可能不同，先依序號暫存再依序產生
+        buckets: Dict[Optional[tuple], List[Tuple[int, Tuple]]] = {}
+        deadlines: Dict[Optional[tuple], float] = {}
+        ready: Dict[int, Tuple] = {}
+        sequence = count()
+        next_index = 0
+        
+        while True:
+            finished = False
+            timeout = None if not deadlines else max(0.0, min(deadlines.values()) - time.perf_counter())
+            
+            try:
+                item = q_load.get(timeout=timeout)
+                if item is None:
+                    finished = True
+                else:
+                    bucket = self._size_bucket(item[1], bucket_px)
+                    buckets.setdefault(bucket, []).append((next(sequence), item))
+                    deadlines.setdefault(bucket, time.perf_counter() + max_wait)
+            except queue.Empty:
+                # 等待逾時，送出逾時的尺寸組
+                pass
+            
+            now = time.perf_counter()
+            due = [bucket for bucket, items in buckets.items()
+                   if finished or bucket is None or len(items) >= batch_size or now >= deadlines[bucket]]
+            
+            for bucket in due:
+                items = buckets.pop(bucket)
+                del deadlines[bucket]
+                indices = [index for index, _ in items]
+                outcomes = self._recognize_pending([item for _, item in items], confidence_threshold)
+                ready.update(zip(indices, outcomes))
+            
+            while next_index in ready:
+                yield ready.pop(next_index)
+                next_index += 1
+            
+            if finished:
+                break
+    
+    @staticmethod
+    def _size_bucket(image, bucket_px: int) -> Optional[tuple]:
+        """圖片所屬的尺寸組（高、寬以 bucket_px 為單位取整）；快取結果與例外不需識別，回傳 None 立即送出"""
+        if not isinstance(image, np.ndarray):
+            return None
+        if bucket_px <= 0:
+            return ()
+        height, width = image.shape[:2]
+        return round(height / bucket_px), round(width / bucket_px)
+    
+    def _recognize_pending(self, pending: List[Tuple], confidence_threshold: float):
+        """以單次 predict 識別累積的圖片，依序逐一產生 (圖片檔案, 結果字典或例外)
+        
+        pending 的每一項為 (圖片檔案, 圖片／快取結果／例外, 縮放比例, 快取鍵)；
+        讀出後即清空 pending，識別完成的圖片不會在產生結果（與後續寫檔）期間繼續被保留
+        """
+        start_time = time.perf_counter()
+        
+        entries = [(image_file, scale, cache_key) for image_file, _, scale, cache_key in pending]
+        outcomes = [image for _, image, _, _ in pending]
+        pending.clear()
+        valid = [i for i, image in enumerate(outcomes) if isinstance(image, np.ndarray)]
+        
+        if valid:
+            try:
+                batch_results = self._predict_batch([outcomes[i] for i in valid])
+                for i, results in zip(valid, batch_results):
+                    outcomes[i] = results
+            except Exception as e:
+                for i in valid:
+                    outcomes[i] = Exception(f"圖片處理失敗: {e}")
         
+        processing_time = (time.perf_counter() - start_time) / len(entries)
+        
+        for i, ((image_file, scale, cache_key), results) in enumerate(zip(entries, outcomes)):
+            if i in valid and not isinstance(results, Exception):
+                try:
+                    results = self._build_result(results, confidence_threshold, processing_time, scale)
+                    self._store_cached_result(cache_key, results)
+                except Exception as e:
+                    results = e
+            yield image_file, results
+    
     def _print_if_verbose(self, message):
         """根據配置決定是否顯示訊息"""
-        simple_output = self.get_config_value('OUTPUT', 'simple_output', True, bool)
+        simple_output = self.cfg.simple_output
         if not simple_output:
             print(message)
 
+    def _print_saved(self, format_type: str, output_path: str):
+        """顯示結果檔已儲存"""
+        labels = {'txt': '結果', 'docx': 'DOCX 檔案', 'pdf': 'PDF 檔案'}
+        print(f"✓ {labels.get(format_type, '結果')}已儲存: {output_path}")
+    
+    def _get_writer_pool(self) -> ThreadPoolExecutor:
+        """取得寫檔執行緒池（第一次使用時建立）"""
+        if self._writer_pool is None:
+            self._writer_pool = ThreadPoolExecutor(max_workers=self.WRITER_POOL_SIZE, thread_name_prefix="ocr-save")
+        return self._writer_pool
+    
     def _print_ocr_result_only(self, result):
         """只顯示 OCR 結果"""
         if result['text_content'].strip():
@@ -337,257 +1179,416 @@ class OptimizedOCRProcessor:
         else:
             print("(無識別內容)")
 
-    def save_result_to_file(self, result: Dict, input_file: str, format_type: str = None) -> str:
-        """儲存結果到檔案"""
+    # 各輸出格式對應的寫入方法
+    _WRITERS = {'txt': '_save_txt', 'docx': '_save_docx', 'pdf': '_save_pdf'}
+    
+    def save_result_to_file(self, result: Dict, input_file: str, format_type: str = None,
+                            processed_at: Optional[datetime] = None, announce: bool = True) -> str:
+        """儲存結果到檔案；processed_at 為處理時間（批量處理時整批共用，未指定時取目前時間）
+        
+        announce=False 時不顯示儲存訊息（由呼叫端依序顯示，例如從寫檔執行緒池呼叫時）
+        """
+        ctx = self._build_write_ctx(result, input_file, format_type, processed_at)
+        writer = self._WRITERS.get(ctx.format_type)
+        if writer is None:
+            return None
+        
+        getattr(self, writer)(ctx.output_path, [ctx])
+        if announce and not ctx.simple_output:
+            self._print_saved(ctx.format_type, ctx.output_path)
+        return ctx.output_path
+    
+    def save_results_in_background(self, items: List[Tuple[object, str]], format_type: str = None):
+        """於寫檔執行緒池平行儲存多筆結果，依序逐一產生輸出檔案路徑（寫入失敗時為例外）並顯示儲存訊息
+        
+        items 的每一項為 (結果字典或例外, 原始檔案)；例外表示識別失敗，直接略過，不產生任何項目。
+        所有寫入在呼叫時即送出，呼叫端可在取用下一筆之前先顯示其他訊息。
+        """
+        if format_type is None:
+            format_type = self.cfg.default_output_format
+        processed_at = datetime.now()
+        
+        pool = self._get_writer_pool()
+        futures = [
+            pool.submit(self.save_result_to_file, result, input_file, format_type, processed_at, announce=False)
+            for result, input_file in items
+            if not isinstance(result, Exception)
+        ]
+        
+        def outputs():
+            for future in futures:
+                try:
+                    output_file = future.result()
+                except Exception as e:
+                    yield e
+                    continue
+                if not self.cfg.simple_output:
+                    self._print_saved(format_type, output_file)
+                yield output_file
+        
+        return outputs()
+    
+    def save_batch_to_file(self, results: List[Tuple[Dict, str]], image_folder: str, format_type: str = None,
+                           processed_at: Optional[datetime] = None, announce: bool = True) -> Optional[str]:
+        """將多筆結果儲存到同一個檔案（以資料夾名稱命名，每張圖片各一頁／一段），回傳輸出檔案路徑
+        
+        results 的每一項為 (結果字典, 原始檔案)；字體與文件只需載入、建立一次
+        """
+        if not results:
+            return None
+        
+        if processed_at is None:
+            processed_at = datetime.now()
+        
+        ctxs = [self._build_write_ctx(result, input_file, format_type, processed_at) for result, input_file in results]
+        format_type = ctxs[0].format_type
+        writer = self._WRITERS.get(format_type)
+        if writer is None:
+            return None
+        
+        # 檔名沿用單一檔案的命名方式，以資料夾名稱取代圖片名稱
+        folder_name = Path(image_folder).resolve().name or 'batch'
+        if self.cfg.simple_output:
+            output_name = f"{folder_name}_batch_ocr.{format_type}"
+        else:
+            output_name = f"{folder_name}_batch_{_format_processed_at(processed_at)[0]}_fixed.{format_type}"
+        output_path = os.path.join(self.cfg.output_folder, output_name)
+        
+        getattr(self, writer)(output_path, ctxs)
+        if announce and not self.cfg.simple_output:
+            self._print_saved(format_type, output_path)
+        return output_path
+    
+    def _build_write_ctx(self, result: Dict, input_file: str, format_type: Optional[str],
+                         processed_at: Optional[datetime]) -> _WriteContext:
+        """一次取得輸出資料夾、檔名與處理時間等資訊"""
         # 如果沒有指定格式，使用配置檔案中的預設格式
         if format_type is None:
-            format_type = self.get_config_value('PROCESSING', 'default_output_format', 'pdf')
+            format_type = self.cfg.default_output_format
         
         # 獲取輸出資料夾
-        output_folder = self.get_config_value('OUTPUT', 'output_folder', './output')
+        output_folder = self.cfg.output_folder
         os.makedirs(output_folder, exist_ok=True)
         
-        # 是否包含統計資訊
-        include_stats = self.get_config_value('OUTPUT', 'include_stats', False, bool)
-        
         # 是否為簡單輸出模式
-        simple_output = self.get_config_value('OUTPUT', 'simple_output', True, bool)
+        simple_output = self.cfg.simple_output
         
-        base_name = Path(input_file).stem
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        input_path = Path(input_file)
+        base_name = input_path.stem
         
-        if format_type == 'txt':
-            # 簡單模式下的檔名
-            if simple_output:
-                output_path = os.path.join(output_folder, f"{base_name}_ocr.txt")
-            else:
-                output_path = os.path.join(output_folder, f"{base_name}_{timestamp}_fixed.txt")
+        if processed_at is None:
+            processed_at = datetime.now()
+        timestamp, processed_time = _format_processed_at(processed_at)
+        
+        # 簡單模式下的檔名
+        if simple_output:
+            output_name = f"{base_name}_ocr.{format_type}"
+        else:
+            output_name = f"{base_name}_{timestamp}_fixed.{format_type}"
+        
+        return _WriteContext(
+            result=result,
+            format_type=format_type,
+            output_path=os.path.join(output_folder, output_name),
+            file_name=input_path.name,
+            processed_time=processed_time,
+            include_stats=self.cfg.include_stats,
+            simple_output=simple_output,
+        )
+    
+    def _save_txt(self, output_path: str, ctxs: List[_WriteContext]):
+        """寫入 TXT 結果檔（多筆結果時依序寫入同一個檔案，簡單模式以檔名分隔）"""
+        parts = []
+        for i, ctx in enumerate(ctxs):
+            if len(ctxs) > 1:
+                if i:
+                    parts.append("\n\n")
+                if ctx.simple_output:
+                    parts.append(f"=== {ctx.file_name} ===\n")
+            parts.extend(self._txt_parts(ctx))
+        
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(''.join(parts))
+    
+    def _txt_parts(self, ctx: _WriteContext) -> List[str]:
+        """組合單一結果的 TXT 內容片段"""
+        result = ctx.result
+        include_stats = ctx.include_stats
+        simple_output = ctx.simple_output
+        file_name = ctx.file_name
+        processed_time = ctx.processed_time
+        
+        if simple_output:
+            # 簡單模式：只寫入 OCR 結果
+            parts = [result['text_content']]
+        else:
+            # 詳細模式：包含完整資訊（先組合所有內容，再一次寫入）
+            parts = [
+                "=== AI-Generated PaddleOCR Testing Demo Tools 處理結果 ===\n",
+                f"原始檔案: {file_name}\n",
+                f"處理時間: {processed_time}\n",
+                f"配置檔案: {self.config_file}\n\n",
+            ]
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                if simple_output:
-                    # 簡單模式：只寫入 OCR 結果
-                    f.write(result['text_content'])
-                else:
-                    # 詳細模式：包含完整資訊
-                    f.write("=== AI-Generated PaddleOCR Testing Demo Tools 處理結果 ===\n")
-                    f.write(f"原始檔案: {Path(input_file).name}\n")
-                    f.write(f"處理時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"配置檔案: {self.config_file}\n\n")
-                    
-                    if include_stats:
-                        stats = result['stats']
-                        f.write("=== 處理統計 ===\n")
-                        f.write(f"處理時間: {stats['processing_time']}\n")
-                        f.write(f"檢測行數: {stats['total_detected']}\n")
-                        f.write(f"接受行數: {stats['accepted_lines']}\n")
-                        f.write(f"字符數: {stats['total_chars']}\n")
-                        f.write(f"詞數: {stats['total_words']}\n")
-                        f.write(f"信心度閾值: {stats['confidence_threshold']}\n")
-                        f.write(f"平均信心度: {stats['average_confidence']:.3f}\n\n")
-                    
-                    f.write("=== 識別內容（過濾後）===\n")
-                    f.write(result['text_content'])
-                    f.write("\n\n")
-                    
-                    if include_stats:
-                        f.write("=== 詳細結果 ===\n")
-                        for i, item in enumerate(result['detailed_results']):
-                            f.write(f"行 {i+1}: '{item['text']}' (信心度: {item['confidence']:.3f})\n")
-                            if item['bbox']:
-                                f.write(f"  座標: {item['bbox']}\n")
-                            f.write("\n")
-                    
-                    if result['all_results'] != result['detailed_results'] and include_stats:
-                        f.write("=== 所有檢測結果（包含低信心度）===\n")
-                        for i, item in enumerate(result['all_results']):
-                            f.write(f"行 {i+1}: '{item['text']}' (信心度: {item['confidence']:.3f})\n")
-                    
-                    # 保存原始 OCR 結果（如果啟用）
-                    if result['raw_ocr_result'] is not None:
-                        f.write("\n=== 原始 OCR 結果 ===\n")
-                        f.write(json.dumps(str(result['raw_ocr_result']), ensure_ascii=False, indent=2))
+            if include_stats:
+                stats = result['stats']
+                parts.append(
+                    "=== 處理統計 ===\n"
+                    f"處理時間: {stats['processing_time']}\n"
+                    f"檢測行數: {stats['total_detected']}\n"
+                    f"接受行數: {stats['accepted_lines']}\n"
+                    f"字符數: {stats['total_chars']}\n"
+                    f"詞數: {stats['total_words']}\n"
+                    f"信心度閾值: {stats['confidence_threshold']}\n"
+                    f"平均信心度: {stats['average_confidence']:.3f}\n\n"
+                )
             
-            if not simple_output:
-                print(f"✓ 結果已儲存: {output_path}")
-            return output_path
-        
-        elif format_type == 'docx':
-            # 簡單模式下的檔名
-            if simple_output:
-                output_path = os.path.join(output_folder, f"{base_name}_ocr.docx")
-            else:
-                output_path = os.path.join(output_folder, f"{base_name}_{timestamp}_fixed.docx")
-            
-            doc = docx.Document()
-            
-            # 設定字體
-            style = doc.styles['Normal']
-            font = style.font
-            font.name = 'Microsoft YaHei'
-            font.size = Pt(12)
-            
-            if simple_output:
-                # 簡單模式：只包含 OCR 內容
-                paragraphs = result['text_content'].split('\n')
-                for para_text in paragraphs:
-                    if para_text.strip():
-                        doc.add_paragraph(para_text)
-                    else:
-                        doc.add_paragraph()
-            else:
-                # 詳細模式：包含完整資訊
-                title = doc.add_heading('AI-Generated PaddleOCR Testing Demo Tools 識別結果', 0)
-                title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                
-                # 檔案資訊
-                info_para = doc.add_paragraph()
-                info_para.add_run(f"原始檔案: {Path(input_file).name}\n").bold = True
-                info_para.add_run(f"處理時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                info_para.add_run(f"配置檔案: {self.config_file}\n")
-                
-                # 統計資訊（如果啟用）
-                if include_stats:
-                    stats = result['stats']
-                    stats_para = doc.add_paragraph()
-                    stats_para.add_run("處理統計:\n").bold = True
-                    stats_para.add_run(f"• 處理時間: {stats['processing_time']}\n")
-                    stats_para.add_run(f"• 檢測行數: {stats['total_detected']}\n")
-                    stats_para.add_run(f"• 接受行數: {stats['accepted_lines']}\n")
-                    stats_para.add_run(f"• 字符數: {stats['total_chars']}\n")
-                    stats_para.add_run(f"• 信心度閾值: {stats['confidence_threshold']}\n")
-                    stats_para.add_run(f"• 平均信心度: {stats['average_confidence']:.3f}\n")
-                
-                # 分隔線
-                doc.add_paragraph("=" * 50)
-                
-                # 識別內容
-                content_heading = doc.add_heading('識別內容', level=1)
-                
-                paragraphs = result['text_content'].split('\n')
-                for para_text in paragraphs:
-                    if para_text.strip():
-                        doc.add_paragraph(para_text)
-                    else:
-                        doc.add_paragraph()
+            parts.append("=== 識別內容（過濾後）===\n")
+            parts.append(result['text_content'])
+            parts.append("\n\n")
             
-            doc.save(output_path)
-            if not simple_output:
-                print(f"✓ DOCX 檔案已儲存: {output_path}")
-            return output_path
+            if include_stats:
+                parts.append("=== 詳細結果 ===\n")
+                parts.extend(
+                    f"行 {i+1}: '{item['text']}' (信心度: {item['confidence']:.3f})\n"
+                    + (f"  座標: {item['bbox'].tolist()}\n" if item['bbox'] is not None and item['bbox'].size else "")
+                    + "\n"
+                    for i, item in enumerate(result['detailed_results'])
+                )
+            
+            # 過濾後結果是全部結果的子集，長度不同即表示有低信心度結果
+            if include_stats and len(result['all_results']) != len(result['detailed_results']):
+                parts.append("=== 所有檢測結果（包含低信心度）===\n")
+                parts.extend(
+                    f"行 {i+1}: '{item['text']}' (信心度: {item['confidence']:.3f})\n"
+                    for i, item in enumerate(result['all_results'])
+                )
+            
+            # 保存原始 OCR 結果（如果啟用）
+            if result['raw_ocr_result'] is not None:
+                parts.append("\n=== 原始 OCR 結果 ===\n")
+                parts.append(json.dumps(str(result['raw_ocr_result']), ensure_ascii=False, indent=2))
         
-        elif format_type == 'pdf':
-            # 簡單模式下的檔名
-            if simple_output:
-                output_path = os.path.join(output_folder, f"{base_name}_ocr.pdf")
-            else:
-                output_path = os.path.join(output_folder, f"{base_name}_{timestamp}_fixed.pdf")
+        return parts
+
+    def _save_docx(self, output_path: str, ctxs: List[_WriteContext]):
+        """寫入 DOCX 結果檔（多筆結果時每筆另起新頁，簡單模式以檔名為標題）"""
+        import docx
+        from docx.shared import Pt
+        
+        doc = docx.Document()
+        
+        # 設定字體
+        style = doc.styles['Normal']
+        font = style.font
+        font.name = 'Microsoft YaHei'
+        font.size = Pt(12)
+        
+        for i, ctx in enumerate(ctxs):
+            if len(ctxs) > 1:
+                if i:
+                    doc.add_page_break()
+                if ctx.simple_output:
+                    doc.add_heading(ctx.file_name, level=1)
+            self._add_docx_content(doc, ctx)
+        
+        doc.save(output_path)
+    
+    def _add_docx_content(self, doc, ctx: _WriteContext):
+        """將單一結果加入 DOCX 文件"""
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        
+        result = ctx.result
+        include_stats = ctx.include_stats
+        simple_output = ctx.simple_output
+        file_name = ctx.file_name
+        processed_time = ctx.processed_time
+        
+        if simple_output:
+            # 簡單模式：只包含 OCR 內容
+            self._append_docx_paragraphs(doc, result['text_content'])
+        else:
+            # 詳細模式：包含完整資訊
+            title = doc.add_heading('AI-Generated PaddleOCR Testing Demo Tools 識別結果', 0)
+            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
             
-            doc = SimpleDocTemplate(output_path, pagesize=A4)
-            styles = getSampleStyleSheet()
+            # 檔案資訊
+            info_para = doc.add_paragraph()
+            info_para.add_run(f"原始檔案: {file_name}\n").bold = True
+            info_para.add_run(f"處理時間: {processed_time}\n")
+            info_para.add_run(f"配置檔案: {self.config_file}\n")
             
-            # 嘗試註冊中文字體
-            try:
-                font_paths = [
-                    "C:/Windows/Fonts/msjh.ttc",    # 微軟正黑體（繁體）
-                    "C:/Windows/Fonts/msyh.ttc",    # 微軟雅黑（簡體）
-                    "C:/Windows/Fonts/simsun.ttc",  # 宋體
-                ]
-                for font_path in font_paths:
-                    if os.path.exists(font_path):
-                        pdfmetrics.registerFont(TTFont('Chinese', font_path))
-                        styles['Normal'].fontName = 'Chinese'
-                        styles['Title'].fontName = 'Chinese'
-                        styles['Heading1'].fontName = 'Chinese'
-                        break
-            except:
-                pass
+            # 統計資訊（如果啟用）
+            if include_stats:
+                stats = result['stats']
+                stats_para = doc.add_paragraph()
+                stats_para.add_run("處理統計:\n").bold = True
+                stats_para.add_run(f"• 處理時間: {stats['processing_time']}\n")
+                stats_para.add_run(f"• 檢測行數: {stats['total_detected']}\n")
+                stats_para.add_run(f"• 接受行數: {stats['accepted_lines']}\n")
+                stats_para.add_run(f"• 字符數: {stats['total_chars']}\n")
+                stats_para.add_run(f"• 信心度閾值: {stats['confidence_threshold']}\n")
+                stats_para.add_run(f"• 平均信心度: {stats['average_confidence']:.3f}\n")
             
-            story = []
-            
-            if simple_output:
-                # 簡單模式：只包含 OCR 內容
-                paragraphs = result['text_content'].split('\n')
-                for para_text in paragraphs:
-                    if para_text.strip():
-                        safe_text = para_text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                        para = Paragraph(safe_text, styles['Normal'])
-                        story.append(para)
-                        story.append(Spacer(1, 6))
-            else:
-                # 詳細模式：包含完整資訊
-                title = Paragraph("AI-Generated PaddleOCR Testing Demo Tools 識別結果", styles['Title'])
-                story.append(title)
-                story.append(Spacer(1, 20))
-                
-                # 檔案資訊
-                info_text = f"""
-                原始檔案: {Path(input_file).name}<br/>
-                處理時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>
-                配置檔案: {self.config_file}
+            # 分隔線
+            doc.add_paragraph("=" * 50)
+            
+            # 識別內容
+            content_heading = doc.add_heading('識別內容', level=1)
+            
+            self._append_docx_paragraphs(doc, result['text_content'])
+    
+    @staticmethod
+    def _append_docx_paragraphs(doc, text: str):
+        """將每一行文字加為一個段落（空行為空段落）
+        
+        直接建立 <w:p><w:r><w:t> 元素並插入文件主體，不經過 add_paragraph 的逐次樣式處理，
+        大量行數時明顯較快；段落同樣套用 Normal 樣式。
+        """
+        from docx.oxml import OxmlElement
+        
+        body = doc.element.body
+        
+        # 段落必須位於文件主體最後的 sectPr（版面設定）之前
+        sect_pr = body.sectPr
+        insert = sect_pr.addprevious if sect_pr is not None else body.append
+        
+        for para_text in text.split('\n'):
+            p = OxmlElement('w:p')
+            if para_text.strip():
+                r = OxmlElement('w:r')
+                r.text = para_text
+                p.append(r)
+            insert(p)
+
+    def _save_pdf(self, output_path: str, ctxs: List[_WriteContext]):
+        """寫入 PDF 結果檔（多筆結果時每筆另起新頁，簡單模式以檔名為標題）"""
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import PageBreak, Paragraph
+        
+        styles = getSampleStyleSheet()
+        
+        # 套用中文字體（僅首次呼叫時註冊）
+        font_name = _register_chinese_font()
+        if font_name:
+            styles['Normal'].fontName = font_name
+            styles['Title'].fontName = font_name
+            styles['Heading1'].fontName = font_name
+        
+        def story():
+            """依序產生 PDF 內容元素（逐頁排版時才建立，不預先保留整份文件）"""
+            for i, ctx in enumerate(ctxs):
+                if len(ctxs) > 1:
+                    if i:
+                        yield PageBreak()
+                    if ctx.simple_output:
+                        yield Paragraph(ctx.file_name.translate(_PDF_ESCAPE), styles['Heading1'])
+                yield from self._pdf_flowables(ctx, styles)
+        
+        _write_pdf(output_path, story())
+    
+    def _pdf_flowables(self, ctx: _WriteContext, styles):
+        """依序產生單一結果的 PDF 內容元素"""
+        from reportlab.platypus import Paragraph, Spacer
+        
+        result = ctx.result
+        include_stats = ctx.include_stats
+        simple_output = ctx.simple_output
+        file_name = ctx.file_name
+        processed_time = ctx.processed_time
+        
+        if not simple_output:
+            # 詳細模式：包含完整資訊
+            yield Paragraph("AI-Generated PaddleOCR Testing Demo Tools 識別結果", styles['Title'])
+            yield Spacer(1, 20)
+            
+            # 檔案資訊（檔名與路徑同樣需要跳脫，避免 & 或 < 破壞段落標記）
+            info_text = f"""
+            原始檔案: {file_name.translate(_PDF_ESCAPE)}<br/>
+            處理時間: {processed_time}<br/>
+            配置檔案: {self.config_file.translate(_PDF_ESCAPE)}
+            """
+            
+            if include_stats:
+                stats = result['stats']
+                info_text += f"""<br/>
+                檢測行數: {stats['total_detected']}<br/>
+                接受行數: {stats['accepted_lines']}<br/>
+                字符數: {stats['total_chars']}<br/>
+                信心度閾值: {stats['confidence_threshold']}<br/>
+                平均信心度: {stats['average_confidence']:.3f}
                 """
-                
-                if include_stats:
-                    stats = result['stats']
-                    info_text += f"""<br/>
-                    檢測行數: {stats['total_detected']}<br/>
-                    接受行數: {stats['accepted_lines']}<br/>
-                    字符數: {stats['total_chars']}<br/>
-                    信心度閾值: {stats['confidence_threshold']}<br/>
-                    平均信心度: {stats['average_confidence']:.3f}
-                    """
-                
-                info_para = Paragraph(info_text, styles['Normal'])
-                story.append(info_para)
-                story.append(Spacer(1, 20))
-                
-                # 內容標題
-                content_title = Paragraph("識別內容", styles['Heading1'])
-                story.append(content_title)
-                story.append(Spacer(1, 12))
-                
-                # 內容
-                paragraphs = result['text_content'].split('\n')
-                for para_text in paragraphs:
-                    if para_text.strip():
-                        safe_text = para_text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                        para = Paragraph(safe_text, styles['Normal'])
-                        story.append(para)
-                        story.append(Spacer(1, 6))
-            
-            doc.build(story)
-            if not simple_output:
-                print(f"✓ PDF 檔案已儲存: {output_path}")
-            return output_path
+            
+            yield Paragraph(info_text, styles['Normal'])
+            yield Spacer(1, 20)
+            
+            # 內容標題
+            yield Paragraph("識別內容", styles['Heading1'])
+            yield Spacer(1, 12)
+        
+        # 內容（簡單模式只包含 OCR 內容）
+        for para_text in result['text_content'].split('\n'):
+            if para_text.strip():
+                yield Paragraph(para_text.translate(_PDF_ESCAPE), styles['Normal'])
+                yield Spacer(1, 6)
 
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _load_font(font_path: str, size: int) -> 'ImageFont.FreeTypeFont':
+        """載入字體（快取，避免重複解析字體檔）"""
+        from PIL import ImageFont
+        return ImageFont.truetype(font_path, size)
+    
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_default_font():
+        """載入預設字體（快取）"""
+        from PIL import ImageFont
+        return ImageFont.load_default()
+    
     def create_better_test_image(self, text: str = "測試繁體中文 English 123", output_path: str = "ai_demo_test.png"):
         """建立 AI-Generated 測試圖片"""
-        img = Image.new('RGB', (1200, 400), 'white')
+        return self.create_test_image_with_array(text, output_path)[0]
+    
+    def create_test_image_with_array(self, text: str, output_path: str) -> Tuple[str, np.ndarray]:
+        """建立 AI-Generated 測試圖片檔案，並同時回傳 BGR 陣列，識別時不必再讀回檔案"""
+        img = self._render_test_image(text)
+        # 測試圖片為暫存用途，使用低壓縮等級加快寫入
+        img.save(output_path, 'PNG', compress_level=1, optimize=False)
+        # 可能由多個執行緒同時建立，以單次寫入輸出整行訊息，避免與其他執行緒的訊息交錯
+        sys.stdout.write(f"✓ AI-Generated 測試圖片已建立: {output_path}\n")
+        return output_path, np.ascontiguousarray(np.asarray(img)[:, :, ::-1])
+    
+    def create_test_image_array(self, text: str = "測試繁體中文 English 123") -> np.ndarray:
+        """建立 AI-Generated 測試圖片並直接回傳 BGR 陣列（不寫入檔案），供 process_image_array 使用"""
+        return np.ascontiguousarray(np.asarray(self._render_test_image(text))[:, :, ::-1])
+    
+    def _render_test_image(self, text: str) -> Image.Image:
+        """在重複使用的畫布上繪製測試圖片"""
+        # 重複使用同一張畫布（每個執行緒各一張，可平行繪製），每次繪製前清為白色
+        img = getattr(self._test_canvas, 'image', None)
+        if img is None:
+            img = self._test_canvas.image = Image.new('RGB', (1200, 400), 'white')
+        img.paste('white', (0, 0, img.width, img.height))
         draw = ImageDraw.Draw(img)
         
         try:
-            # 嘗試使用支援繁體中文的字體
-            font_paths = [
-                "C:/Windows/Fonts/msjh.ttc",    # 微軟正黑體（繁體）
-                "C:/Windows/Fonts/msyh.ttc",    # 微軟雅黑
-                "C:/Windows/Fonts/simsun.ttc",  # 宋體
-                "C:/Windows/Fonts/arial.ttf",   # Arial
-            ]
-            
+            # 嘗試使用支援繁體中文的字體（存在的字體路徑只查找一次）
             font = None
-            for font_path in font_paths:
+            for font_path in _existing_font_paths(TEST_IMAGE_FONT_PATHS):
                 try:
-                    font = ImageFont.truetype(font_path, 48)
-                    print(f"✓ 使用字體: {font_path}")
+                    font = self._load_font(font_path, 48)
+                    sys.stdout.write(f"✓ 使用字體: {font_path}\n")
                     break
                 except:
                     continue
             
             if font is None:
-                font = ImageFont.load_default()
-                print("⚠️ 使用預設字體")
+                font = self._load_default_font()
+                sys.stdout.write("⚠️ 使用預設字體\n")
         
         except:
-            font = ImageFont.load_default()
+            font = self._load_default_font()
         
         # 計算文字位置（置中）
         bbox = draw.textbbox((0, 0), text, font=font)
@@ -606,13 +1607,11 @@ class OptimizedOCRProcessor:
         draw.text((x, y), text, font=font, fill='black')
         
         # 添加標籤
-        label_font = ImageFont.load_default()
+        label_font = self._load_default_font()
         label_text = "AI-Generated PaddleOCR Testing Demo"
         draw.text((10, 10), label_text, font=label_font, fill='gray')
         
-        img.save(output_path, 'PNG', quality=95)
-        print(f"✓ AI-Generated 測試圖片已建立: {output_path}")
-        return output_path
+        return img
     
     def batch_process_images(self, image_folder: str, confidence_threshold: float = None, output_format: str = None) -> List[str]:
         """批量處理圖片"""
@@ -621,20 +1620,17 @@ class OptimizedOCRProcessor:
         
         # 使用配置檔案的預設值
         if confidence_threshold is None:
-            confidence_threshold = self.get_config_value('PROCESSING', 'confidence_threshold', 0.9, float)
+            confidence_threshold = self.cfg.confidence_threshold
         
         if output_format is None:
-            output_format = self.get_config_value('PROCESSING', 'default_output_format', 'pdf')
+            output_format = self.cfg.default_output_format
         
-        simple_output = self.get_config_value('OUTPUT', 'simple_output', True, bool)
+        simple_output = self.cfg.simple_output
         
-        # 支援的圖片格式
-        supported_formats = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif')
-        image_files = []
-        
-        for file in os.listdir(image_folder):
-            if file.lower().endswith(supported_formats):
-                image_files.append(os.path.join(image_folder, file))
+        # os.scandir 一次取得檔名與類型，不需逐一 join 路徑或額外 stat；副檔名以集合查詢比對
+        with os.scandir(image_folder) as entries:
+            image_files = [entry.path for entry in entries
+                           if entry.name.rpartition('.')[2].lower() in SUPPORTED_IMAGE_EXTS and entry.is_file()]
         
         if not image_files:
             self._print_if_verbose("資料夾中沒有找到支援的圖片檔案")
@@ -646,35 +1642,188 @@ class OptimizedOCRProcessor:
             print(f"使用信心度閾值: {confidence_threshold}")
             print(f"輸出格式: {output_format}")
         
-        output_files = []
+        # 每次送入 OCR 的最大圖片數（未滿時等待 max_wait_ms 後送出）
+        batch_size = max(1, self.cfg.batch_size)
         
-        for i, image_file in enumerate(image_files, 1):
-            if simple_output:
-                # 簡單模式：只顯示檔案名和結果
-                print(f"=== {os.path.basename(image_file)} ===")
-            else:
-                # 詳細模式
-                print(f"\n處理第 {i}/{len(image_files)} 個檔案: {os.path.basename(image_file)}")
+        # 平行處理程序數（每個程序各自載入模型）；使用 GPU 時維持單一程序，避免多個程序爭用 GPU 記憶體
+        workers = self.get_config_value('PROCESSING', 'workers', 1, int)
+        if workers == 0:
+            workers = min(4, max(1, (os.cpu_count() or 2) // 2))
+        if workers > 1 and self.cfg.use_gpu:
+            self._print_if_verbose("使用 GPU 時不啟用平行子程序，改以單一程序批次處理")
+            workers = 1
+        
+        # 所有結果合併為單一檔案時，由目前程序收集結果後一次寫出
+        if self.get_config_value('OUTPUT', 'combine_batch_output', False, bool):
+            return self._batch_process_combined(image_folder, image_files, confidence_threshold, output_format,
+                                                batch_size, simple_output)
+        
+        if workers > 1 and len(image_files) > batch_size:
+            output_files = self._batch_process_parallel(image_files, confidence_threshold, output_format,
+                                                        batch_size, workers, simple_output)
+            
+            if not simple_output:
+                print(f"\n批量處理完成，成功處理 {len(output_files)}/{len(image_files)} 個檔案")
             
+            return output_files
+        
+        output_files = []
+        
+        # 三段管線：載入執行緒 → 識別（目前執行緒）→ 寫出執行緒，以有界佇列串接
+        # 整批共用同一個處理時間，避免每個檔案重複取得與格式化時間
+        processed_at = datetime.now()
+        q_write = queue.Queue(maxsize=4)
+        
+        # DOCX/PDF 交由寫檔執行緒池平行產生；TXT 寫入成本低，直接在寫出執行緒完成
+        max_pending_writes = self.WRITER_POOL_SIZE * 2
+        
+        def report(index, image_file, result, future):
+            # 顯示訊息統一於寫出階段依序輸出，維持逐檔順序
+            self._print_file_header(index, len(image_files), image_file, simple_output)
             try:
-                result = self.process_image(image_file, confidence_threshold)
-                output_file = self.save_result_to_file(result, image_file, output_format)
+                if isinstance(result, Exception):
+                    raise result
+                
+                self._print_result_summary(result, simple_output)
+                if future is not None:
+                    output_file = future.result()
+                else:
+                    output_file = self.save_result_to_file(result, image_file, output_format, processed_at, announce=False)
                 output_files.append(output_file)
                 
                 if not simple_output:
+                    self._print_saved(output_format, output_file)
                     print(f"✓ 完成，識別 {len(result['text_content'])} 個字符")
-                    
             except Exception as e:
-                if simple_output:
-                    print("(處理失敗)")
-                else:
-                    print(f"✗ 處理失敗: {e}")
+                self._print_failure(e, simple_output)
+        
+        def write_results():
+            pending = deque()
+            while True:
+                item = q_write.get()
+                if item is None:
+                    break
+                index, image_file, result = item
+                
+                future = None
+                if output_format != 'txt' and not isinstance(result, Exception):
+                    future = self._get_writer_pool().submit(self.save_result_to_file, result, image_file,
+                                                            output_format, processed_at, announce=False)
+                pending.append((index, image_file, result, future))
+                
+                # 依序回報已完成的檔案；未完成的寫入過多時等待最早的一個
+                while pending and (pending[0][3] is None or pending[0][3].done() or len(pending) > max_pending_writes):
+                    report(*pending.popleft())
+            
+            while pending:
+                report(*pending.popleft())
+        
+        writer = threading.Thread(target=write_results, name="ocr-writer")
+        writer.start()
+        
+        try:
+            batch_results = self.process_images_batched(image_files, confidence_threshold, batch_size)
+            for i, (image_file, result) in enumerate(batch_results, 1):
+                q_write.put((i, image_file, result))
+        finally:
+            q_write.put(None)
+            writer.join()
         
         if not simple_output:
             print(f"\n批量處理完成，成功處理 {len(output_files)}/{len(image_files)} 個檔案")
         
         return output_files
     
+    def _batch_process_combined(self, image_folder: str, image_files: List[str], confidence_threshold: float,
+                                output_format: str, batch_size: int, simple_output: bool) -> List[str]:
+        """批量識別後將所有結果寫入同一個檔案（每張圖片各一頁／一段）"""
+        processed_at = datetime.now()
+        combined = []
+        
+        batch_results = self.process_images_batched(image_files, confidence_threshold, batch_size)
+        for index, (image_file, result) in enumerate(batch_results, 1):
+            self._print_file_header(index, len(image_files), image_file, simple_output)
+            if isinstance(result, Exception):
+                self._print_failure(result, simple_output)
+                continue
+            
+            self._print_result_summary(result, simple_output)
+            combined.append((result, image_file))
+        
+        output_file = self.save_batch_to_file(combined, image_folder, output_format, processed_at)
+        
+        if not simple_output:
+            print(f"\n批量處理完成，成功處理 {len(combined)}/{len(image_files)} 個檔案")
+        
+        return [output_file] if output_file else []
+    
+    def _print_failure(self, error, simple_output: bool):
+        """顯示單一檔案處理失敗"""
+        if simple_output:
+            print("(處理失敗)")
+        else:
+            print(f"✗ 處理失敗: {error}")
+    
+    def _print_file_header(self, index: int, total: int, image_file: str, simple_output: bool):
+        """顯示批量處理中目前檔案的標題"""
+        if simple_output:
+            # 簡單模式：只顯示檔案名和結果
+            print(f"=== {os.path.basename(image_file)} ===")
+        else:
+            # 詳細模式
+            print(f"\n處理第 {index}/{total} 個檔案: {os.path.basename(image_file)}")
+    
+    def _batch_process_parallel(self, image_files: List[str], confidence_threshold: float, output_format: str,
+                                batch_size: int, workers: int, simple_output: bool) -> List[str]:
+        """以多個子程序平行處理圖片分片，每個子程序各自初始化 OCR 引擎"""
+        # 子程序沿用目前配置（含命令列覆蓋）
+        overrides = {section: dict(self.config.items(section)) for section in self.config.sections()}
+        
+        shards = [image_files[i:i + batch_size] for i in range(0, len(image_files), batch_size)]
+        workers = min(workers, len(shards))
+        
+        # cpu_threads 為自動時由各子程序平分 CPU 核心，避免推理執行緒總數超過核心數
+        if self.get_config_value('OCR', 'cpu_threads', 0, int) <= 0:
+            overrides.setdefault('OCR', {})['cpu_threads'] = str(max(1, (os.cpu_count() or 1) // workers))
+
+        if not simple_output:
+            print(f"使用 {workers} 個子程序平行處理 {len(shards)} 個分片")
+        
+        output_files = []
+        index = 0
+        
+        # 所有分片共用同一個處理時間（檔名時間戳記與檔案內的處理時間一致）
+        processed_at = datetime.now()
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(self.config_file, overrides)) as executor:
+            futures = {
+                executor.submit(_process_shard_in_worker, shard, confidence_threshold, output_format, processed_at): shard
+                for shard in shards
+            }
+            
+            for future in as_completed(futures):
+                try:
+                    shard_outcomes = future.result()
+                except Exception as e:
+                    shard_outcomes = [(image_file, None, None, str(e)) for image_file in futures[future]]
+                
+                for image_file, output_file, text_content, error in shard_outcomes:
+                    index += 1
+                    self._print_file_header(index, len(image_files), image_file, simple_output)
+                    
+                    if error is not None:
+                        self._print_failure(error, simple_output)
+                        continue
+                    
+                    output_files.append(output_file)
+                    if simple_output:
+                        self._print_ocr_result_only({'text_content': text_content})
+                    else:
+                        print(f"✓ 完成，識別 {len(text_content)} 個字符")
+        
+        return output_files
+    
     def print_current_config(self):
         """顯示當前配置"""
         print("\n=== AI-Generated PaddleOCR Testing Demo Tools - 當前配置 ===")
@@ -686,6 +1835,92 @@ class OptimizedOCRProcessor:
                 print(f"  {key} = {value}")
 
 
+# 批量處理子程序中的處理器（每個子程序載入一次模型）
+_worker_processor = None
+
+
+def _init_batch_worker(config_file: str, config_overrides: Dict[str, Dict[str, str]]):
+    """初始化批量處理子程序；子程序的輸出由主程序統一顯示"""
+    global _worker_processor
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    
+    # fork 啟動時會繼承主程序已建立的引擎；Paddle 預測器跨 fork 共用並不安全，子程序一律自行建立
+    OptimizedOCRProcessor._engine_cache.clear()
+    OptimizedOCRProcessor._warmed_engines.clear()
+    _worker_processor = OptimizedOCRProcessor(config_file, config_overrides)
+
+
+def _process_shard_in_worker(image_files: List[str], confidence_threshold: float, output_format: str,
+                             processed_at: datetime) -> List[Tuple]:
+    """在子程序中處理一個圖片分片，回傳 [(圖片檔案, 輸出檔案, 識別內容, 錯誤訊息), ...]
+    
+    processed_at 為主程序取得的整批處理時間，各分片的輸出檔名與內容使用相同時間
+    """
+    processor = _worker_processor
+    if processor is None or processor.ocr_engine is None:
+        raise RuntimeError("PaddleOCR 引擎未初始化")
+    
+    simple_output = processor.cfg.simple_output
+    outcomes = []
+    
+    for image_file, result in processor.process_images_batched(image_files, confidence_threshold, len(image_files)):
+        try:
+            if isinstance(result, Exception):
+                raise result
+            
+            output_file = processor.save_result_to_file(result, image_file, output_format, processed_at)
+            outcomes.append((image_file, output_file, result['text_content'], None))
+        except Exception as e:
+            outcomes.append((image_file, None, None, str(e)))
+    
+    return outcomes
+
+
+def _format_lines(text: str) -> str:
+    """將識別內容逐行加上引號與縮排，組合為單一字串（一次寫出，不逐行 print）"""
+    return ''.join(f"  '{line}'\n" for line in text.split('\n'))
+
+
+@lru_cache(maxsize=1)
+def _prompt_toolkit_completers() -> Optional[Dict[str, object]]:
+    """選用：prompt_toolkit 的自動完成（路徑、輸出格式）；未安裝或輸入不是終端機時回傳 None"""
+    if not sys.stdin.isatty():
+        return None
+    try:
+        from prompt_toolkit.completion import PathCompleter, WordCompleter
+    except ImportError:
+        return None
+    return {
+        'path': PathCompleter(expanduser=True),
+        'format': WordCompleter(['txt', 'docx', 'pdf']),
+    }
+
+
+def _ask(message: str, completer: Optional[str] = None) -> str:
+    """讀取一行輸入（已去除前後空白）；已安裝 prompt_toolkit 時提供路徑與輸出格式的自動完成"""
+    completers = _prompt_toolkit_completers()
+    if completers is None:
+        return input(message).strip()
+    
+    from prompt_toolkit import prompt
+    return prompt(message, completer=completers.get(completer), complete_while_typing=True).strip()
+
+
+def _ask_int(message: str, minimum: int = 0) -> Optional[int]:
+    """讀取整數參數，輸入無效時重新詢問；留空時回傳 None"""
+    while True:
+        answer = _ask(message)
+        if not answer:
+            return None
+        try:
+            value = int(answer)
+            if value >= minimum:
+                return value
+        except ValueError:
+            pass
+        print(f"⚠️ 請輸入不小於 {minimum} 的整數")
+
+
 def main():
     """主函數"""
     print("🤖 AI-Generated PaddleOCR Testing Demo Tools")
@@ -701,32 +1936,58 @@ def main():
     parser.add_argument('--config', help='指定配置檔案路徑')
     parser.add_argument('--show-config', action='store_true', help='顯示當前配置')
     parser.add_argument('--simple', action='store_true', help='簡單輸出模式（只顯示 OCR 結果）')
+    parser.add_argument('--combine', action='store_true', help='批量處理時將所有結果合併為單一檔案（覆蓋配置檔案）')
+    parser.add_argument('--workers', type=int, help='批量處理的平行子程序數，0 = 自動（覆蓋配置檔案）')
+    parser.add_argument('--batch-size', type=int, help='批量處理時每次送入 OCR 的最大圖片數（覆蓋配置檔案）')
+    parser.add_argument('--prefetch', type=int, help='批量處理時預先載入的圖片數，0 = batch_size 的兩倍（覆蓋配置檔案）')
+    parser.add_argument('--max-wait-ms', type=int, help='批次未滿時最多等待的毫秒數（覆蓋配置檔案）')
     
     args = parser.parse_args()
     
     # 使用指定的配置檔案
     config_file = args.config if args.config else "paddleocr_config.ini"
-    processor = OptimizedOCRProcessor(config_file)
     
-    # 如果命令列指定了語言，臨時覆蓋配置
+    # 命令列參數臨時覆蓋配置（語言、簡單模式），在建立引擎前套用，避免重新初始化
+    overrides = {}
     if args.lang:
-        processor.config.set('OCR', 'lang', args.lang)
+        overrides.setdefault('OCR', {})['lang'] = args.lang
         print(f"✓ 命令列覆蓋語言設定: {args.lang}")
-        # 重新初始化 OCR 引擎
-        processor._init_ocr_engine()
-        
-    # 如果命令列指定了簡單模式，臨時覆蓋配置
     if args.simple:
-        processor.config.set('OUTPUT', 'simple_output', 'True')
+        overrides.setdefault('OUTPUT', {})['simple_output'] = 'True'
+    if args.combine:
+        overrides.setdefault('OUTPUT', {})['combine_batch_output'] = 'True'
+    for key in ('workers', 'batch_size', 'prefetch', 'max_wait_ms'):
+        value = getattr(args, key)
+        if value is not None:
+            overrides.setdefault('PROCESSING', {})[key] = str(value)
     
-    if processor.ocr_engine is None:
-        print("OCR 引擎初始化失敗")
-        return
+    processor = OptimizedOCRProcessor(config_file, overrides, lazy=True)
     
+    # 顯示配置不需要載入模型
     if args.show_config:
         processor.print_current_config()
         return
     
+    interactive = not (args.test or args.folder or args.file)
+    
+    if interactive:
+        # 互動模式在背景載入並預熱模型，使用者閱讀選單與輸入時即可完成
+        engine_loader = threading.Thread(target=processor.ensure_ocr_engine, kwargs={'quiet': True},
+                                         name="ocr-warmup", daemon=True)
+        engine_loader.start()
+    elif processor.ensure_ocr_engine() is None:
+        print("OCR 引擎初始化失敗")
+        return
+    
+    def engine_ready() -> bool:
+        """等待背景載入完成並顯示載入過程的訊息，回傳引擎是否可用"""
+        engine_loader.join()
+        processor.flush_engine_messages()
+        if processor.ocr_engine is None:
+            print("OCR 引擎初始化失敗")
+            return False
+        return True
+    
     if args.test:
         print("🧪 建立並測試 AI-Generated 示例圖片...")
         
@@ -737,18 +1998,29 @@ def main():
             ("混合 Mixed 123", "ai_demo_mixed.png")
         ]
         
-        for text, filename in test_images:
+        # 先平行建立所有測試圖片，再以單次批次識別；測試圖片直接在記憶體中交給 OCR，省去 PNG 編碼、寫檔與解碼
+        with ThreadPoolExecutor(max_workers=len(test_images)) as executor:
+            images = list(executor.map(processor.create_test_image_array, [text for text, _ in test_images]))
+        results = processor.process_image_arrays(images, args.confidence)
+        
+        # 結果檔於背景平行寫出，顯示訊息仍依序輸出
+        outputs = processor.save_results_in_background(
+            [(result, filename) for (_, filename), result in zip(test_images, results)], args.format)
+        
+        for (text, filename), result in zip(test_images, results):
             print(f"\n🔍 處理測試: {text[:20]}...")
-            img_path = processor.create_better_test_image(text, filename)
             
             try:
-                result = processor.process_image(img_path, args.confidence)
-                output_file = processor.save_result_to_file(result, img_path, args.format)
+                if isinstance(result, Exception):
+                    raise result
+                processor._print_result_summary(result, processor.cfg.simple_output)
+                output_file = next(outputs)
+                if isinstance(output_file, Exception):
+                    raise output_file
                 
                 print(f"✓ 成功處理，識別內容:")
                 if result['text_content']:
-                    for line in result['text_content'].split('\n'):
-                        print(f"  '{line}'")
+                    sys.stdout.write(_format_lines(result['text_content']))
                 else:
                     print("  (無內容)")
                     
@@ -771,14 +2043,13 @@ def main():
             result = processor.process_image(args.file, args.confidence)
             output_file = processor.save_result_to_file(result, args.file, args.format)
             
-            simple_output = processor.get_config_value('OUTPUT', 'simple_output', True, bool)
+            simple_output = processor.cfg.simple_output
             
             if not simple_output:
                 print(f"\n✓ AI-Generated Demo 處理完成")
                 print(f"識別內容:")
                 if result['text_content']:
-                    for line in result['text_content'].split('\n'):
-                        print(f"  '{line}'")
+                    sys.stdout.write(_format_lines(result['text_content']))
                 else:
                     print("  (無內容)")
                 
@@ -799,6 +2070,9 @@ def main():
     while True:
         choice = input("\n請選擇操作 (1-5): ").strip()
         
+        if choice in ('1', '2', '3') and not engine_ready():
+            continue
+        
         if choice == '1':
             test_images = [
                 ("Hello World", "ai_demo_test_en.png"),
@@ -806,13 +2080,25 @@ def main():
                 ("Mixed 混合內容 123", "ai_demo_test_mixed.png")
             ]
             
-            for text, filename in test_images:
+            # 先平行建立所有測試圖片（各自寫入不同檔案），再以單次批次識別；直接使用繪製好的陣列，不再讀回檔案
+            with ThreadPoolExecutor(max_workers=len(test_images)) as executor:
+                created = list(executor.map(processor.create_test_image_with_array, *zip(*test_images)))
+            img_paths = [img_path for img_path, _ in created]
+            batched = list(zip(img_paths, processor.process_image_arrays([image for _, image in created])))
+            
+            # 結果檔於背景平行寫出，顯示訊息仍依序輸出
+            outputs = processor.save_results_in_background([(result, img_path) for img_path, result in batched])
+            
+            for (text, _), (img_path, result) in zip(test_images, batched):
                 print(f"\n🔍 處理測試: {text}")
-                img_path = processor.create_better_test_image(text, filename)
                 
                 try:
-                    result = processor.process_image(img_path)
-                    output_file = processor.save_result_to_file(result, img_path)
+                    if isinstance(result, Exception):
+                        raise result
+                    processor._print_result_summary(result, processor.cfg.simple_output)
+                    output_file = next(outputs)
+                    if isinstance(output_file, Exception):
+                        raise output_file
                     
                     print(f"✓ 識別內容: '{result['text_content']}'")
                     
@@ -820,27 +2106,31 @@ def main():
                     print(f"✗ 處理失敗: {e}")
         
         elif choice == '2':
-            file_path = input("請輸入圖片檔案路徑: ").strip().strip('"')
+            file_path = _ask("請輸入圖片檔案路徑: ", 'path').strip('"')
             if os.path.exists(file_path):
-                # 詢問是否覆蓋配置
-                use_custom = input("是否自訂參數？(y/N): ").strip().lower() == 'y'
-                
-                if use_custom:
-                    format_choice = input("選擇輸出格式 (txt/docx/pdf, 留空使用配置檔案): ").strip() or None
-                    confidence_input = input("信心度閾值 (0.0-1.0, 留空使用配置檔案): ").strip()
-                    confidence = float(confidence_input) if confidence_input else None
-                else:
-                    format_choice = None
-                    confidence = None
+                # 在詢問參數的同時於背景讀取圖片檔案（模型已於啟動時載入並預熱）
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr-prefetch") as prefetcher:
+                    prefetched = prefetcher.submit(processor._read_image_bytes, file_path)
+                    
+                    # 詢問是否覆蓋配置
+                    use_custom = _ask("是否自訂參數？(y/N): ").lower() == 'y'
+                    
+                    if use_custom:
+                        format_choice = _ask("選擇輸出格式 (txt/docx/pdf, 留空使用配置檔案): ", 'format') or None
+                        confidence_input = _ask("信心度閾值 (0.0-1.0, 留空使用配置檔案): ")
+                        confidence = float(confidence_input) if confidence_input else None
+                    else:
+                        format_choice = None
+                        confidence = None
                 
                 try:
-                    result = processor.process_image(file_path, confidence)
+                    # 重複處理同一個未變更的檔案時直接使用本次工作階段先前的結果
+                    result = processor.process_image_memoized(file_path, confidence, prefetched.result())
                     output_file = processor.save_result_to_file(result, file_path, format_choice)
                     
                     print(f"✓ 處理完成，識別內容:")
                     if result['text_content']:
-                        for line in result['text_content'].split('\n'):
-                            print(f"  '{line}'")
+                        sys.stdout.write(_format_lines(result['text_content']))
                     else:
                         print("  (無內容)")
                     
@@ -850,15 +2140,29 @@ def main():
                 print("檔案不存在")
         
         elif choice == '3':
-            folder_path = input("請輸入圖片資料夾路徑: ").strip().strip('"')
+            folder_path = _ask("請輸入圖片資料夾路徑: ", 'path').strip('"')
             if os.path.exists(folder_path):
                 # 詢問是否覆蓋配置
-                use_custom = input("是否自訂參數？(y/N): ").strip().lower() == 'y'
+                use_custom = _ask("是否自訂參數？(y/N): ").lower() == 'y'
                 
                 if use_custom:
-                    format_choice = input("選擇輸出格式 (txt/docx/pdf, 留空使用配置檔案): ").strip() or None
-                    confidence_input = input("信心度閾值 (0.0-1.0, 留空使用配置檔案): ").strip()
+                    format_choice = _ask("選擇輸出格式 (txt/docx/pdf, 留空使用配置檔案): ", 'format') or None
+                    confidence_input = _ask("信心度閾值 (0.0-1.0, 留空使用配置檔案): ")
                     confidence = float(confidence_input) if confidence_input else None
+                    
+                    # 平行與批次參數（本次執行期間有效，可選擇寫回配置檔案作為預設值）
+                    processing_values = {}
+                    workers = _ask_int("平行子程序數 (0 = 自動, 留空使用配置檔案): ")
+                    if workers is not None:
+                        processing_values['workers'] = str(workers)
+                    batch_size = _ask_int("每批圖片數 (留空使用配置檔案): ", minimum=1)
+                    if batch_size is not None:
+                        processing_values['batch_size'] = str(batch_size)
+                    
+                    for key, value in processing_values.items():
+                        processor.set_config_value('PROCESSING', key, value)
+                    if processing_values and _ask("是否儲存為預設值？(y/N): ").lower() == 'y':
+                        processor.save_config_values('PROCESSING', processing_values)
                 else:
                     format_choice = None
                     confidence = None